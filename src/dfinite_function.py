@@ -19,6 +19,12 @@ dfinite_function
 from sage.rings.ring import Algebra
 from numpy import random
 from math import factorial
+from collections import OrderedDict
+import bisect
+import mmap
+import os
+import pickle
+import struct
 
 class DFiniteFunctionRing(Algebra):
     """
@@ -324,6 +330,169 @@ class DFiniteFunctionRing(Algebra):
 ####################################################################################################
 
 
+class TermCheckpoints(object):
+    """
+    A store of checkpoints for the terms of a D-finite sequence.
+
+    A checkpoint consists of an index e together with the r consecutive sequence terms
+    with the indices e-r+1, ..., e, where r is the order of the annihilator. Given such a
+    checkpoint, any term with index n > e can be computed without starting over
+    from the initial values. Checkpoints are only created at multiples of ``spacing``.
+
+    Input:
+        - spacing ... (optional) distance between two checkpoints
+        - maxsize ... (optional) maximal number of checkpoints held in memory; when it is
+                      exceeded, the least recently used checkpoint is evicted
+        - filename ... (optional) name of a file to which all checkpoints are appended.
+                       Evicted checkpoints are then read back from this file via a memory map
+                       when they are needed, and the checkpoints survive the session:
+                       a store created with the filename of an existing store knows all
+                       its checkpoints. The file must not be shared among different sequences.
+
+    EXAMPLE:
+        sage: A = OreAlgebra(ZZ['n'],'Sn')
+        sage: D = DFiniteFunctionRing(A)
+        sage: store = TermCheckpoints(spacing=100, maxsize=2)
+        sage: a = UnivariateDFiniteSequence(D, "Sn**2 - Sn - 1", [0,1], cache=store)
+        sage: a[1000] == fibonacci(1000)
+        True
+        sage: a[1234] == fibonacci(1234)
+        True
+        sage: sorted(store.indices())
+        [1000, 1200]
+        sage: a[950] == fibonacci(950)
+        True
+        sage: len(store)
+        2
+    """
+
+    _header = struct.Struct("<Q")
+
+    def __init__(self, spacing=1000, maxsize=1000, filename=None):
+        self._spacing = spacing
+        self._maxsize = maxsize
+        self._memory = OrderedDict()  # index -> terms, in order of last use
+        self._indices = []            # sorted list of all known indices
+        self._offsets = {}            # index -> (offset, length) of the record in the file
+        self._file = None
+        self._map = None
+        if filename is not None:
+            self._file = open(filename, "a+b")
+            self._scan()
+
+    def _scan(self):
+        """
+        reads the index of the records in the underlying file
+        """
+        self._remap()
+        size = len(self._map) if self._map is not None else 0
+        offset = 0
+        while offset + self._header.size <= size:
+            length = self._header.unpack_from(self._map, offset)[0]
+            if offset + self._header.size + length > size:
+                break
+            index, _ = pickle.loads(self._map[offset + self._header.size:offset + self._header.size + length])
+            if index not in self._offsets:
+                bisect.insort(self._indices, index)
+            self._offsets[index] = (offset + self._header.size, length)
+            offset += self._header.size + length
+        if offset < size:
+            # incomplete record from an interrupted session
+            self._map.close()
+            self._map = None
+            self._file.truncate(offset)
+            self._remap()
+
+    def _remap(self):
+        """
+        maps the (possibly grown) underlying file into memory
+        """
+        self._file.flush()
+        size = os.fstat(self._file.fileno()).st_size
+        if self._map is not None and len(self._map) == size:
+            return
+        if self._map is not None:
+            self._map.close()
+        self._map = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ) if size > 0 else None
+
+    def spacing(self):
+        """
+        returns the distance between two checkpoints
+        """
+        return self._spacing
+
+    def indices(self):
+        """
+        returns the list of indices of all known checkpoints
+        """
+        return list(self._indices)
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __getitem__(self, index):
+        """
+        returns the list of terms stored at the checkpoint with the given index
+        """
+        if index in self._memory:
+            terms = self._memory.pop(index)
+        elif index in self._offsets:
+            offset, length = self._offsets[index]
+            if self._map is None or len(self._map) < offset + length:
+                self._remap()
+            terms = pickle.loads(self._map[offset:offset + length])[1]
+        else:
+            raise KeyError(index)
+        self._remember(index, terms)
+        return terms
+
+    def __setitem__(self, index, terms):
+        """
+        adds a checkpoint
+        """
+        terms = list(terms)
+        if index not in self._memory and index not in self._offsets:
+            bisect.insort(self._indices, index)
+        if self._file is not None and index not in self._offsets:
+            data = pickle.dumps((index, terms), 2)
+            self._file.seek(0, os.SEEK_END)
+            offset = self._file.tell()
+            self._file.write(self._header.pack(len(data)))
+            self._file.write(data)
+            self._file.flush()
+            self._offsets[index] = (offset + self._header.size, len(data))
+        self._remember(index, terms)
+
+    def _remember(self, index, terms):
+        self._memory.pop(index, None)
+        self._memory[index] = terms
+        while len(self._memory) > self._maxsize:
+            index, _ = self._memory.popitem(last=False)
+            if self._file is None:
+                del self._indices[bisect.bisect_left(self._indices, index)]
+
+    def floor(self, n):
+        """
+        returns the largest index of a checkpoint which does not exceed n, or None
+        """
+        i = bisect.bisect_right(self._indices, n)
+        return self._indices[i - 1] if i > 0 else None
+
+    def close(self):
+        """
+        closes the underlying file, if any. The in-memory checkpoints remain available.
+        """
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._indices = sorted(self._memory)
+            self._offsets = {}
+
+#############################################################################################################
+
 class DFiniteFunction(RingElement): #inherited from RingElement, abstract class
     """
     An object depending on one or more differential and one or more discrete variables
@@ -767,11 +936,16 @@ class DFiniteFunction(RingElement): #inherited from RingElement, abstract class
 class UnivariateDFiniteSequence(DFiniteFunction):
     """
     D-finite sequence in a single (differentiable or discrete) variable.
+
+    If ``cache`` is a TermCheckpoints object, checkpoints of the sequence are recorded
+    in it while terms are computed, and later term computations resume from the
+    nearest checkpoint instead of from the initial values.
     """
     def __init__(self, parent, ann, initial_val, is_gen=False, construct=False, cache=True):
         if not parent.ore_algebra().is_S():
             raise TypeError, "Not the Shift Operator"
         super(UnivariateDFiniteSequence, self).__init__(parent, ann, initial_val, is_gen, construct, cache)
+        self._checkpoints = cache if isinstance(cache, TermCheckpoints) else None
 
     # action
 
@@ -969,6 +1143,12 @@ class UnivariateDFiniteSequence(DFiniteFunction):
             sage: a = UnivariateDFiniteSequence(D, Sn**2 - Sn - 1, [0,1]) #the Fibonacci numbers
             sage: a.expand(10)
             [0, 1, 1, 2, 3, 5, 8, 13, 21, 34]
+            sage: store = TermCheckpoints(spacing=4)
+            sage: b = UnivariateDFiniteSequence(D, Sn**2 - Sn - 1, [0,1], cache=store)
+            sage: b.expand(10)
+            [0, 1, 1, 2, 3, 5, 8, 13, 21, 34]
+            sage: sorted(store.indices()), store[8]
+            ([4, 8], [13, 21])
 
         """
         ord = self._ann.order()
@@ -988,7 +1168,9 @@ class UnivariateDFiniteSequence(DFiniteFunction):
         #2nd case: n is smaller than all relevant singularities - nothing to worry about
         s = [x for x in self._initial_values if ord <= x]
         if all(n < x for x in s):
-            return self._ann.to_list(self.initial_values(),n, -start)[start:]
+            result = self._ann.to_list(self.initial_values(),n, -start)[start:]
+            self._record_checkpoints(result)
+            return result
 
         #3rd case: there is at least one singularity in the first n terms of the sequence
         s = [x for x in self._initial_values if ord <= x < n]
@@ -999,7 +1181,53 @@ class UnivariateDFiniteSequence(DFiniteFunction):
             result.append(self._initial_values[m])
             s.remove(m)
         self._ann.to_list(result,n,-start,true)
+        self._record_checkpoints(result[start:])
         return result[start:]
+
+    def _record_checkpoints(self, terms):
+        """
+        stores checkpoints for the given list of the first terms of ``self``
+        (if ``self`` has a checkpoint store)
+        """
+        store = self._checkpoints
+        ord = self._ann.order()
+        if store is None or ord == 0:
+            return
+        for e in range(store.spacing(), len(terms), store.spacing()):
+            window = terms[e-ord+1:e+1]
+            if e-ord+1 >= 0 and None not in window:
+                store[e] = window
+
+    def _term_from_checkpoints(self, n, start):
+        """
+        computes the n-th term of ``self`` starting from the nearest checkpoint below n,
+        and records a new checkpoint on the way if appropriate
+        """
+        store = self._checkpoints
+        ann = self._ann
+        ord = ann.order()
+        values = self.initial_conditions()
+
+        e = store.floor(n)
+        if e is None:
+            terms = self.initial_values()
+            e = start + ord - 1
+        else:
+            terms = store[e]
+        if n == e:
+            return terms[-1]
+
+        E = n - n % store.spacing()
+        if E > e:
+            terms = ann._nth_window(terms, E, e-ord+1, values)
+            if terms is None:
+                return None
+            store[E] = terms
+            e = E
+            if n == e:
+                return terms[-1]
+
+        return ann.nth_term(terms, n, e-ord+1, values=values)
         
     def __getitem__(self,n):
         """
@@ -1043,37 +1271,22 @@ class UnivariateDFiniteSequence(DFiniteFunction):
                 raise ValueError, "term self(" + str(-num) + ") could not be computed"
     
         #normal case: n >= 0
+        if self.parent()._backward_calculation is false and min(self.initial_conditions()) < 0:
+            start = min(self.initial_conditions())
+        else:
+            start = 0
+
         try:
-            ord = self._ann.order()
-            roots = [x - ord for x in self.singularities(backwards = false) if 0 <= x-ord <= n]
-        
-            if self.parent()._backward_calculation is false and min(self.initial_conditions) < 0:
-                start = min(self.initial_conditions())
+            if self._checkpoints is not None and self._ann.order() > 0:
+                result = self._term_from_checkpoints(n, start)
             else:
-                start = 0
-            int_val = self.initial_values()
-
-            while len(roots) > 0:
-                root = min(roots)
-                Q,M = self._ann.forward_matrix_bsplit(root-start,start)
-                v = Matrix([int_val]).transpose()/M
-                result = Q * v
-                if n < root + ord:
-                    d = n - (root+ord)
-                    return result[d][0]
-                else:
-                    int_val = [result[i][0] for i in range(1,result.nrows())] + [self.initial_conditions()[root+ord]]
-                    start = root+1
-                    roots.remove(root)
-
-            Q,M = self._ann.forward_matrix_bsplit(n-start,start)
-            v = Matrix([int_val]).transpose()/M
-            result = Q * v
-            return result[0][0]
+                result = self._ann.nth_term(self.initial_values(), n, start, values=self.initial_conditions())
+        except (ValueError, TypeError, ZeroDivisionError):
+            result = None
 
-        #TODO: getting rid of this exception - had no time left to do this
-        except:
+        if result is None:
             return self.expand(n+1)[n]
+        return result
 
 
 ###############################################################################################################
@@ -3,6 +3,7 @@
 Evaluation of univariate D-finite functions by numerical analytic continuation
 """
 
+import functools
 import logging
 
 import sage.rings.all as rings
@@ -26,7 +27,7 @@ logger = logging.getLogger(__name__)
 # TODO: clean up and reorganize
 class Context(object):
 
-    def __init__(self, dop, path, eps, keep="last", algorithm=None):
+    def __init__(self, dop, path, eps, keep="last", algorithm=None, ncpus=1):
         if not dop:
             raise ValueError("operator must be nonzero")
         _, _, _, self.dop = dop._normalize_base_ring()
@@ -48,15 +49,23 @@ class Context(object):
 
         if isinstance(algorithm, str):
             if algorithm == "naive":
-                from . import naive_sum as mod
+                from . import naive_sum
+                self.fundamental_matrix_ordinary = (
+                        naive_sum.fundamental_matrix_ordinary)
             elif algorithm == "binsplit":
-                from . import binary_splitting as mod
+                from . import binary_splitting
+                # binary splitting is the only method using several processes
+                self.fundamental_matrix_ordinary = functools.partial(
+                        binary_splitting.fundamental_matrix_ordinary,
+                        ncpus=ncpus)
             else:
                 raise ValueError("algorithm", algorithm)
-            self.fundamental_matrix_ordinary = mod.fundamental_matrix_ordinary
         else:
             self.fundamental_matrix_ordinary = None
 
+        # Number of processes used by binary splitting
+        self.ncpus = ncpus
+
         self.subdivide = True
         self.optimize_path = self.use_bit_burst = False
         if self.subdivide:
@@ -98,7 +107,7 @@ def ordinary_step_transition_matrix(ctx, step, eps, rows):
             except accuracy.PrecisionError:
                 pass
         return binary_splitting.fundamental_matrix_ordinary(
-                ldop, step.delta(), eps, rows, maj)
+                ldop, step.delta(), eps, rows, maj, ncpus=ctx.ncpus)
     else:
         return naive_sum.fundamental_matrix_ordinary(
                 ldop, step.delta(), eps, rows, maj)
@@ -52,6 +52,14 @@ TESTS::
 
     sage: logger.setLevel(logging.WARNING)
 
+    sage: val = (Dx - 1).numerical_solution([1], [0, 1], 1e-50,
+    ....:                                   algorithm="binsplit", ncpus=2)
+    sage: val.overlaps(RBF(e))
+    True
+    sage: val.overlaps((Dx - 1).numerical_solution([1], [0, 1], 1e-50,
+    ....:                                          algorithm="binsplit"))
+    True
+
     sage: from ore_algebra.analytic.binary_splitting import MatrixRec
 
     sage: rec = MatrixRec((x-2)*Dx^3 - 1, RBF(1/3), 3, 10)
@@ -60,6 +68,18 @@ TESTS::
     [[-0.029...]  [0.996...] [0.666...]]
     [[-0.091...] [-0.015...] [0.996...]]
 
+    sage: rec.partial_sums(rec.binsplit(0, 100, ncpus=4), RBF, 3)
+    [ [0.996...]  [0.333...] [0.111...]]
+    [[-0.029...]  [0.996...] [0.666...]]
+    [[-0.091...] [-0.015...] [0.996...]]
+
+    sage: from ore_algebra.analytic.examples import fcc
+    sage: val = fcc.dop4.numerical_solution( # long time
+    ....:          [0, 0, 0, 1], [0, 1/4], 1e-100, algorithm='binsplit', ncpus=2)
+    sage: val.overlaps(fcc.dop4.numerical_solution( # long time
+    ....:          [0, 0, 0, 1], [0, 1/4], 1e-100, algorithm='binsplit'))
+    True
+
     sage: QQi.<i> = QuadraticField(-1)
     sage: rec = MatrixRec((x-i)*Dx^3 - 1, RBF(1/3), 3, 10)
     sage: rec.partial_sums(rec.binsplit(0, 10), CBF, 3)
@@ -86,6 +106,7 @@ from sage.rings.number_field.number_field import NumberField, is_NumberField
 from sage.rings.power_series_ring import PowerSeriesRing
 
 from .. import ore_algebra
+from ..tools import WorkerPool
 from . import accuracy, bounds, utilities
 
 from .safe_cmp import *
@@ -378,7 +399,9 @@ class MatrixRec(object):
 
         return stepmat
 
-    def binsplit(self, low, high):
+    def binsplit(self, low, high, ncpus=1, pool=None):
+        if ncpus > 1 and high - low > ncpus*self.binsplit_threshold:
+            return self._binsplit_parallel(low, high, ncpus, pool)
         if high - low <= self.binsplit_threshold:
             mat = self.one(low)
             for n in xrange(low, high):
@@ -389,6 +412,38 @@ class MatrixRec(object):
             mat.imulleft(self.binsplit(mid, high))
         return mat
 
+    def worker_pool(self, ncpus):
+        r"""
+        Return a pool of ncpus worker processes computing products of
+        recurrence matrices, to be passed to binsplit() and closed by the
+        caller. The workers are forked once and inherit this object.
+        """
+        return WorkerPool(_binsplit_chunk, self, ncpus)
+
+    def _binsplit_parallel(self, low, high, ncpus, pool=None):
+        r"""
+        Same as binsplit(), but with the top levels of the product tree
+        distributed among ncpus processes. The partial products are then
+        multiplied together (as a balanced tree) in the calling process.
+        Uses the given pool of workers if any, and a temporary one otherwise.
+        """
+        if pool is None:
+            with self.worker_pool(ncpus) as pool:
+                return self._binsplit_parallel(low, high, ncpus, pool)
+        cuts = [low + (i*(high - low))//ncpus for i in xrange(ncpus + 1)]
+        chunks = sorted((arg[0], mat)
+                        for arg, mat in pool.map(zip(cuts[:-1], cuts[1:])))
+        mats = [mat for _, mat in chunks]
+        logger.debug("binsplit: %s partial products on %s cpus",
+                len(mats), ncpus)
+        while len(mats) > 1:
+            prods = [mats[i].imulleft(mats[i+1])
+                     for i in xrange(0, len(mats) - 1, 2)]
+            if len(mats) % 2:
+                prods.append(mats[-1])
+            mats = prods
+        return mats[0]
+
     def __repr__(self):
         return pprint.pformat(self.__dict__)
 
@@ -453,18 +508,24 @@ class MatrixRec(object):
         den = abs(prod.rec_den)*abs(prod.pow_den)
         return num1*num2/den
 
+def _binsplit_chunk(rec, arg):
+    low, high = arg
+    return rec.binsplit(low, high)
+
 def binsplit_step_seq(start):
     low, high = start, start + 64
     while True:
         yield (low, high)
         low, high = high, 2*high
 
-def fundamental_matrix_ordinary(dop, pt, eps, rows, maj):
+def fundamental_matrix_ordinary(dop, pt, eps, rows, maj, ncpus=1):
     r"""
     INPUT:
 
     - ``eps`` -- a bound on the tail (does not take into account roundoff errors
       such as that committed when converting the result to intervals)
+    - ``ncpus`` -- number of processes among which the top levels of the
+      product trees are distributed
     """
     logger.log(logging.INFO - 1, "target error = %s", eps)
     maj.refine()
@@ -479,12 +540,18 @@ def fundamental_matrix_ordinary(dop, pt, eps, rows, maj):
             get_residuals=lambda: rec.normalized_residuals(maj, prod, n),
             get_bound=lambda(resid):
                 maj.matrix_sol_tail_bound(n, rad, resid, rows=rows))
-    for last, n in binsplit_step_seq(0):
-        prod = rec.binsplit(last, n) * prod
-        done, tail_bound = stopping_criterion.check(n, tail_bound,
-                est=rec.error_estimate(prod), next_stride=n)
-        if done:
-            break
+    # the same workers serve all strides
+    pool = rec.worker_pool(ncpus) if ncpus > 1 else None
+    try:
+        for last, n in binsplit_step_seq(0):
+            prod = rec.binsplit(last, n, ncpus, pool) * prod
+            done, tail_bound = stopping_criterion.check(n, tail_bound,
+                    est=rec.error_estimate(prod), next_stride=n)
+            if done:
+                break
+    finally:
+        if pool is not None:
+            pool.close()
     is_real = utilities.is_real_parent(pt.parent())
     Intervals = utilities.ball_field(eps, is_real)
     mat = rec.partial_sums(prod, Intervals, rows)
@@ -29,7 +29,11 @@ except:
 
 #######################################
 
+import itertools
 import math
+import mmap
+import os
+import tempfile
 from datetime import datetime
 
 from sage.rings.integer_ring import ZZ
@@ -39,15 +43,15 @@ from sage.rings.finite_rings.finite_field_base import is_FiniteField
 from sage.matrix.constructor import Matrix, matrix
 from sage.matrix.matrix_space import MatrixSpace
 from sage.rings.arith import xgcd
-from sage.parallel.decorate import parallel
 from sage.rings.polynomial.polynomial_ring import is_PolynomialRing
 from sage.rings.polynomial.polynomial_ring_constructor import PolynomialRing
 from sage.modules.free_module_element import vector
 from sage.sets.primes import Primes
 
 from . import nullspace
-from .nullspace import _hermite
+from .nullspace import _order_basis, _interpolation_basis, _pow_mod
 from .ore_algebra import OreAlgebra
+from .tools import WorkerPool
 
 def guess_rec(data, n, S, **kwargs):
     """
@@ -88,7 +92,11 @@ def guess(data, algebra, **kwargs):
     - ``data`` -- a list of elements of the algebra's base ring's base ring `K` (or at least
       of objects which can be casted into this ring). If ``data`` is a string, it is assumed
       to be the name of a text file which contains the terms, one per line, encoded in a way
-      that can be interpreted by the element constructor of `K`. 
+      that can be interpreted by the element constructor of `K`. Instead of a list, ``data``
+      can also be any other iterable. If `K` is `ZZ` or `QQ`, terms from files and iterables
+      are not converted to Sage objects but kept as decimal digits in a memory mapped buffer,
+      from which their images modulo the primes used during the computation are obtained 
+      directly. 
     - ``algebra`` -- a univariate Ore algebra over a univariate polynomial ring whose
       generator is the standard derivation, the standard shift, the forward difference,
       a q-shift, or a commutative variable. 
@@ -98,7 +106,9 @@ def guess(data, algebra, **kwargs):
     - ``cut`` -- if `N` is the minimum number of terms needed for some particular
       choice of order and degree, and if ``len(data)`` is more than ``N+cut``,
       use ``data[:N+cut]`` instead of ``data``. This must be a nonnegative integer
-      or ``None``. Default: ``None``.
+      or ``None``. Default: ``None``. When guessing via homomorphic images, the
+      terms beyond those needed for the orders and degrees still under consideration
+      are discarded as soon as the search path is known.
     - ``ensure`` -- if `N` is the minimum number of terms needed for some particular
       choice of order and degree, and if ``len(data)`` is less than ``N+ensure``,
       raise an error. This must be a nonnegative integer. Default: 0.
@@ -117,7 +127,14 @@ def guess(data, algebra, **kwargs):
       path is chosen which examines all the `(r, d)` which can be tested with the
       given amount of data. 
     - ``solver`` -- function to be used for computing the right kernel of a matrix
-      with elements in `K`. 
+      with elements in `K`. When guessing algebraic equations over `GF(p)`, no such
+      kernel is computed and this option is ignored. 
+    - ``verify`` -- if ``True`` and `K` is `ZZ` or `QQ`, every operator obtained by
+      rational reconstruction from modular images is applied to the data modulo an
+      additional prime, and the computation stops as soon as this test succeeds. This
+      allows to accept reconstructions with a smaller safety margin, which typically
+      saves the last one or two modular images. Only supported for recurrences and
+      differential equations; ignored otherwise. Default: ``False``.
     - ``infolevel`` -- an integer specifying the level of details of progress
       reports during the calculation. 
 
@@ -140,6 +157,14 @@ def guess(data, algebra, **kwargs):
       sage: rec = guess([(2*i+1)^15 * (1 + 2^i + 3^i)^2 for i in xrange(1000)], OreAlgebra(ZZ['n'], 'Sn'))
       sage: rec.order(), rec.degree()
       (6, 90)
+      sage: guess((fibonacci(n) for n in xrange(50)), OreAlgebra(ZZ['n'], 'Sn'))
+      Sn^2 - Sn - 1
+      sage: rec = guess([catalan_number(i) for i in xrange(50)], OreAlgebra(ZZ['n'], 'Sn'), verify=True)
+      sage: rec.order(), rec.degree()
+      (1, 1)
+      sage: rec = guess([catalan_number(i) for i in xrange(50)], OreAlgebra(ZZ['n'], 'Sn'), ncpus=2)
+      sage: rec.order(), rec.degree()
+      (1, 1)
       sage: R.<t> = QQ['t']
       sage: rec = guess([1/(i+t) + t^i for i in xrange(100)], OreAlgebra(R['n'], 'Sn'))
       sage: rec
@@ -149,9 +174,16 @@ def guess(data, algebra, **kwargs):
 
     A = algebra; R = A.base_ring(); K = R.base_ring(); x = R.gen()
 
-    if type(data) == str:
-        with open(data, 'r') as f:
-            data = [ K(line) for line in f ]
+    if not isinstance(data, (list, tuple, _TermStore)):
+        # file name or iterator: integer and rational terms are kept as digits and reduced modulo primes
+        # without turning them into Sage objects; other terms are read into a list
+        if A.ngens() == 1 and R.ngens() == 1 and (K is ZZ or K is QQ):
+            data = _TermStore(data)
+        elif type(data) == str:
+            with open(data, 'r') as f:
+                data = [ K(line) for line in f ]
+        else:
+            data = list(data)
 
     if A.ngens() > 1 or R.ngens() > 1:
         return guess_mult(data, algebra, **kwargs)
@@ -218,7 +250,7 @@ def guess(data, algebra, **kwargs):
 
 ###########################################################################################
 
-def guess_raw(data, A, order=-1, degree=-1, lift=None, solver=None, cut=25, ensure=0, infolevel=0):
+def guess_raw(data, A, order=-1, degree=-1, lift=None, solver=None, cut=25, ensure=0, ansatz=None, infolevel=0):
     """
     Guesses recurrence or differential equations for a given sample of terms.
 
@@ -232,7 +264,11 @@ def guess_raw(data, A, order=-1, degree=-1, lift=None, solver=None, cut=25, ensu
     - ``lift`` (optional) -- a function to be applied to the terms in ``data``
       prior to computation
     - ``solver`` (optional) -- a function to be used to compute the nullspace
-      of a matrix with entries in the base ring of the base ring of ``A``
+      of a matrix with entries in the base ring of the base ring of ``A``.
+      If the terms belong to a univariate polynomial ring over ``ZZ`` or a
+      prime field, the default is an order basis solver (applied modulo
+      several primes in the case of ``ZZ``), otherwise it is the preferred
+      solver of ``A``. 
     - ``cut`` (optional) -- if `N` is the minimum number of terms needed for
       the the specified order and degree and ``len(data)`` is more than ``N+cut``,
       use ``data[:N+cut]`` instead of ``data``. This must be a nonnegative integer
@@ -240,6 +276,11 @@ def guess_raw(data, A, order=-1, degree=-1, lift=None, solver=None, cut=25, ensu
     - ``ensure`` (optional) -- if `N` is the minimum number of terms needed
       for the specified order and degree and ``len(data)`` is less than ``N+ensure``,
       raise an error. This must be a nonnegative integer.
+    - ``ansatz`` (optional) -- a dictionary in which the columns of the ansatz
+      matrix are stored, so that calls for the same ``data`` with other orders and
+      degrees can extract their matrices from it instead of recomputing the
+      products of the terms. Pass the same (initially empty) dictionary to all
+      these calls. 
     - ``infolevel`` (optional) -- an integer indicating the desired amount of
       progress report to be printed during the calculation. Default: 0 (no output).
 
@@ -299,51 +340,52 @@ def guess_raw(data, A, order=-1, degree=-1, lift=None, solver=None, cut=25, ensu
     deform = (lambda n: q[1]**n) if q is not False else (lambda n: n)
     min_len_data = (order + 1)*(degree + 2)
 
+    rows = len(data)
     if cut is not None and len(data) > min_len_data + cut:
-        data = data[:min_len_data + cut]
+        rows = min_len_data + cut
+        if ansatz is None:
+            data = data[:rows] # a shared ansatz is built from all the data
 
-    if len(data) < min_len_data + ensure:
+    if rows < min_len_data + ensure:
         raise ValueError, "not enough terms"
 
-    if lift is not None:
-        data = map(lift, data)
-
-    if not all(p in K for p in data):
-        raise ValueError, "illegal term in data list"
-
-    if solver is None:
+    if ansatz is None:
+        ansatz = dict()
+    if ansatz.get('data') is not data:
+        ansatz.clear(); ansatz['data'] = data
+        terms = data if lift is None else map(lift, data)
+        if not all(p in K for p in terms):
+            raise ValueError, "illegal term in data list"
+        ansatz[0] = terms; ansatz['n'] = [deform(n) for n in xrange(len(terms))]
+
+    def base(k):
+        # diff_case: coefficients of D^k (data), else: n^k * data; both cached in ansatz
+        if not ansatz.has_key(k):
+            nn = ansatz['n']; prev = base(k - 1)
+            if diff_case:
+                ansatz[k] = map(lambda a,b: a*b, prev[1:], nn[1:len(prev)])
+            else:
+                ansatz[k] = map(lambda a,b: a*b, prev, nn)
+        return ansatz[k]
+
+    if solver is None and is_PolynomialRing(K) and K.base_ring() is ZZ:
+        solver = nullspace.cra(nullspace.newton(nullspace.sage_native, order_basis=True))
+    elif solver is None and is_PolynomialRing(K) and K.base_ring().is_prime_field() and K.characteristic() > 0:
+        solver = nullspace.newton(nullspace.sage_native, order_basis=True)
+    elif solver is None:
         solver = A._solver(K)
         
     if solver is None:
         solver = nullspace.sage_native
 
-    sys = {(0,0):data}
-    nn = [deform(n) for n in xrange(len(data))]
-    z = [K.zero()]
-
+    # the matrix has rows - order rows and one column for each (i, j), i <= degree, j <= order
+    trim = rows - order; z = [K.zero()]
     if diff_case:
-        # sys[i, j] contains ( x^i * D^j ) (data)
-        nn = nn[1:]
-        for j in xrange(order):
-            sys[0, j + 1] = map(lambda a,b: a*b, sys[0, j][1:], nn)
-            nn.pop(); 
-        for i in xrange(degree):
-            for j in xrange(order + 1):
-                sys[i + 1, j] = z + sys[i, j]
+        # column (i, j) contains ( x^i * D^j ) (data)
+        sys = [ (z*i + base(j))[:trim] for j in xrange(order + 1) for i in xrange(degree + 1) ]
     else:
-        # sys[i, j] contains ( (n+j)^i * S^j ) (data)
-        for i in xrange(degree):
-            sys[i + 1, 0] = map(lambda a,b: a*b, sys[i, 0], nn)
-        for j in xrange(order):
-            for i in xrange(degree + 1):
-                sys[i, j + 1] = sys[i, j][1:]
-
-    sys = [sys[i, j] for j in xrange(order + 1) for i in xrange(degree + 1) ]
-
-    trim = min(len(c) for c in sys)
-    for i in xrange(len(sys)):
-        if len(sys[i]) > trim:
-            sys[i] = sys[i][:trim]
+        # column (i, j) contains ( (n+j)^i * S^j ) (data)
+        sys = [ base(i)[j:j + trim] for j in xrange(order + 1) for i in xrange(degree + 1) ]
 
     sys = matrix(K, zip(*sys))
 
@@ -366,12 +408,12 @@ def guess_raw(data, A, order=-1, degree=-1, lift=None, solver=None, cut=25, ensu
 
 def guess_hp(data, A, order=-1, degree=-1, lift=None, cut=25, ensure=0, infolevel=0):
     """
-    Guesses differential equations or algebraic equations for a given sample of terms.
+    Guesses recurrence equations, differential equations or algebraic equations for a given sample of terms.
 
     INPUT:
 
     - ``data`` -- list of terms
-    - ``A`` -- an Ore algebra of differential operators or ordinary polynomials. 
+    - ``A`` -- an Ore algebra of recurrence operators, differential operators or ordinary polynomials. 
     - ``order`` -- maximum order of the sought operators
     - ``degree`` -- maximum degree of the sought operators
     - ``lift`` (optional) -- a function to be applied to the terms in ``data``
@@ -388,21 +430,28 @@ def guess_hp(data, A, order=-1, degree=-1, lift=None, cut=25, ensure=0, infoleve
 
     OUTPUT:
 
-    A basis of the ``K``-vector space of all the operators `L` in ``A`` of order
-    at most ``order`` and degree at most ``degree`` such that `L` applied to
-    the truncated power series with ``data`` as terms gives the zero power series.
+    A list of operators `L` in ``A`` of order at most ``order`` and degree at most
+    ``degree`` such that `L` applied to ``data`` gives an array of zeros (resp. `L`
+    applied to the truncated power series with ``data`` as terms gives the zero power
+    series). Every such operator is a `K[x]`-linear combination of the output
+    operators, and the output operators have minimal degrees with this property.
 
     An error is raised in the following situations:
 
     * the algebra ``A`` has more than one generator, or its unique generator
-      is neither a standard derivation nor a commutative variable. 
+      is neither a standard shift nor a standard derivation nor a commutative variable. 
     * ``data`` contains some item which does not belong to ``K``, even after
       application of ``lift``
     * if the condition on ``ensure`` is violated. 
+    * in the shift case, if the characteristic of `K` is smaller than the number of
+      terms used. 
 
     ALGORITHM:
 
-    Hermite-Pade approximation.
+    Hermite-Pade approximation via order bases, computed by divide and conquer
+    with multiplication of polynomial matrices. In the shift case, the approximation
+    problem is an interpolation problem at the points `0, 1, 2, \dots`, and the
+    approximants are computed by an iterative interpolation basis algorithm. 
 
     .. NOTE::
 
@@ -419,6 +468,9 @@ def guess_hp(data, A, order=-1, degree=-1, lift=None, cut=25, ensure=0, infoleve
       [(x^4 + 819*x^3 + 136*x^2 + 17*x + 635)*Dx^4 + (14*x^3 + 417*x^2 + 952*x + 605)*Dx^3 + (598*x^2 + 497*x + 99)*Dx^2 + (598*x + 794)*Dx + 893]
       sage: len(guess_hp(data, OreAlgebra(R, 'C'), order=16, degree=64, lift=K))
       1
+      sage: R.<n> = K['n']
+      sage: guess_hp([fibonacci(k) for k in xrange(50)], OreAlgebra(R, 'Sn'), order=2, degree=0, lift=K)
+      [Sn^2 + 1090*Sn + 1090]
     """
 
     if min(order, degree) < 0:
@@ -433,7 +485,7 @@ def guess_hp(data, A, order=-1, degree=-1, lift=None, cut=25, ensure=0, infoleve
     info(1, datetime.today().ctime() + ": Hermite/Pade guessing started.")
     info(1, "len(data)=" + str(len(data)) + ", algebra=" + str(A._latex_()))
 
-    if A.ngens() > 1 or (not A.is_C() and not A.is_D() ):
+    if A.ngens() > 1 or (not A.is_C() and not A.is_D() and not A.is_S()):
         raise TypeError, "unexpected algebra"
 
     diff_case = True if A.is_D() else False
@@ -451,23 +503,33 @@ def guess_hp(data, A, order=-1, degree=-1, lift=None, cut=25, ensure=0, infoleve
     if not all(p in K for p in data):
         raise ValueError, "illegal term in data list"
 
-    if diff_case:
-        series = [R(data)]
-        for i in xrange(order):
-            series.append(series[-1].derivative())
-        truncate = len(data) - order 
-        series = [s.truncate(truncate) for s in series]
+    if A.is_S():
+        # sum_j p_j(n) data[n + j] = 0 for n = 0, 1, ..., truncate - 1
+        truncate = len(data) - order
+        if 0 < K.characteristic() < truncate:
+            raise ValueError, "not enough evaluation points"
+        values = [ data[j:j + truncate] for j in xrange(order + 1) ]
+        info(2, datetime.today().ctime() + ": matrix construction completed.")
+        P, _ = _interpolation_basis(values, range(truncate), [0]*(order + 1), R)
     else:
-        truncate = len(data)
-        series = [R.one(), R(data)]
-        for i in xrange(order - 1):
-            series.append((series[1]*series[-1]).truncate(truncate))
-
-    info(2, datetime.today().ctime() + ": matrix construction completed.")
-    sol = _hermite(True, matrix(R, [series]), [degree], infolevel - 2, truncate = truncate - 1)
+        if diff_case:
+            series = [R(data)]
+            for i in xrange(order):
+                series.append(series[-1].derivative())
+            truncate = len(data) - order 
+            series = [s.truncate(truncate) for s in series]
+        else:
+            truncate = len(data)
+            series = [R.one(), R(data)]
+            for i in xrange(order - 1):
+                series.append((series[1]*series[-1]).truncate(truncate))
+        info(2, datetime.today().ctime() + ": matrix construction completed.")
+        P, _ = _order_basis(matrix(R, [series]), truncate, [0]*(order + 1))
     info(2, datetime.today().ctime() + ": hermite pade approximation completed.")
 
-    sol = [A(map(R, s)) for s in sol]
+    # the columns of degree at most 'degree' generate all solutions of degree at most 'degree'
+    sol = [ P.column(j) for j in xrange(order + 1) if max(p.degree() for p in P.column(j)) <= degree ]
+    sol = [A(list(s)) for s in sol]
     sol = [(~L.leading_coefficient().leading_coefficient())*L for L in sol]
 
     return sol    
@@ -489,6 +551,10 @@ def _guess_via_hom(data, A, modulus, to_hom, **kwargs):
 
     - ``L`` in ``A``, the guessed operator.
     - if the option ``return_short_path`` is given and ``True``, return the pair ``(L, path)``.
+
+    If the option ``verify`` is given and ``True``, reconstructed operators are accepted with a
+    smaller safety margin, but only after they have been checked against the data modulo a
+    fresh modulus. This is done in case 1 for shift and differential operators only.
     
     Covers three cases:
 
@@ -522,9 +588,14 @@ def _guess_via_hom(data, A, modulus, to_hom, **kwargs):
     mod = K.one() if atomic else ZZ.one()
     order_adjustment = None
 
-    nn = 0; path = []; ncpus = 1
+    nn = 0; path = []; pool = None; nterms = None
     return_short_path = kwargs.has_key('return_short_path') and kwargs['return_short_path'] is True
 
+    verify = kwargs.has_key('verify') and kwargs['verify'] is True and K is ZZ and (A.is_S() or A.is_D())
+    if kwargs.has_key('verify'):
+        del kwargs['verify']
+    margin = ZZ(64) if verify else None
+
     def op2vec(L, r, d):
         # convert an operator L of order <=r and degree <=d to a vector of dimension (r+1)*(d+1).
         c = []
@@ -541,130 +612,233 @@ def _guess_via_hom(data, A, modulus, to_hom, **kwargs):
             c.append(R([v[(d + 1)*i + j] for j in range(d + 1)]))
         return A(c)
 
-    while mod != 0:
-
-        nn += 1 # iteration counter
-
-        if nn == 1:
-            # 1st iteration: use the path specified by the user (or a default path)
-            kwargs['return_short_path'] = True
-
-        elif nn == 2 and atomic and path[0][0] >= Lp.order() + 2:
-            # 2nd iteration: try to optimize the path obtained in the 1st iteration 
-            r0 = Lp.order(); d0 = Lp.degree(); r1, d1 = path[0]
-            # determine the hyperbola through (r0,d0) and (r1,d1) and 
-            # choose (r2,d2) as the point on this hyperbola for which (r2+1)*(d2+1) is minimized
-            try: 
-                r2 = r0 - 1 + math.sqrt(abs((d0-d1)*r0*(r0-1.-r1)/(d0+r0+d1*(r0-1.-r1)-r1)))
-                d2 = (d1*(r0-1-r1)*(r0-r2) + d0*(r1-r2))/((r0-r1)*(r0-1-r2))
-                r2 = int(math.ceil(r2)); d2 = int(math.ceil(d2))
-                if abs(r2 - r1) >= 2 and abs(d2 - d1) >= 2:
-                    path = [ (i, d2 + ((d1-d2)*(i-r2))/(r1-r2)) for i in xrange(r2, r1, cmp(r1, r2)) ] + path
-                    kwargs['path'] = path
-                else:
+    def merge_images(imgs):
+        # chinese remaindering (resp. interpolation) of the images of one round, along a product tree
+        for (Lpp, pp) in imgs:
+            if Lpp.is_zero():
+                info(2, "unlucky modulus " + str(pp) + " discarded")
+        imgs = [ (Lpp, pp) for (Lpp, pp) in imgs if not Lpp.is_zero() ]
+        if len(imgs) == 0:
+            return A.zero(), K.one()
+        v, m = _crt_tree([ op2vec(Lpp, r, d) for (Lpp, pp) in imgs ], [ pp for (Lpp, pp) in imgs ])
+        return vec2op(v, r, d), m
+
+    def op2residues(L):
+        # the coefficients of an operator over a homomorphic image as nested lists of python integers
+        if atomic:
+            return [ [ int(c) for c in L[i].list() ] for i in xrange(L.order() + 1) ]
+        return [ [ [ int(e) for e in c.list() ] for c in L[i].list() ] for i in xrange(L.order() + 1) ]
+
+    def check(L):
+        # apply L to the data modulo a fresh prime, using O(len(data)*r*d) word operations
+        if order_adjustment > 0:
+            s = L.parent().sigma()
+            L = L.map_coefficients(lambda p: s(p, order_adjustment))
+        terms = None
+        while terms is None:
+            p = modulus.next()
+            try:
+                terms = data.reduce(p) if isinstance(data, _TermStore) else map(to_hom(p), data)
+            except ArithmeticError:
+                info(2, "unlucky modulus discarded.")
+        info(2, "verification modulo " + str(p))
+        p = int(p); terms = [ int(c) for c in terms ]
+        r = L.order(); N = len(terms) - r
+        coeffs = [ [ int(c) % p for c in L[i].list() ] for i in xrange(r + 1) ]
+        if A.is_S():
+            # sum_i L[i](n)*data[n + i] for n = 0, ..., N - 1
+            for n in xrange(N):
+                acc = 0
+                for i in xrange(r + 1):
+                    v = 0
+                    for c in reversed(coeffs[i]):
+                        v = (v*n + c) % p
+                    acc += v*terms[n + i]
+                if acc % p != 0:
+                    return False
+        else:
+            # coefficients of x^n in sum_i L[i]*D^i(data) for n = 0, ..., N - 1,
+            # where D^i(data) has the coefficients (m+1)*...*(m+i)*data[m + i]
+            ders = []
+            for i in xrange(r + 1):
+                der = []
+                for m in xrange(N):
+                    f = terms[m + i]
+                    for k in xrange(1, i + 1):
+                        f = f*(m + k) % p
+                    der.append(f)
+                ders.append(der)
+            for n in xrange(N):
+                acc = 0
+                for i in xrange(r + 1):
+                    for j in xrange(min(n, len(coeffs[i]) - 1) + 1):
+                        acc += coeffs[i][j]*ders[i][n - j]
+                if acc % p != 0:
+                    return False
+        return True
+
+    if kwargs.has_key('ncpus') and kwargs['ncpus'] > 1 and not A.is_Q():
+        # the workers are started right away, so that also the first images are computed in parallel.
+        # Each worker receives the data only once, when it is created; afterwards only moduli, search
+        # paths and the number of terms to use are sent to it, and only the residues of the guessed
+        # operators come back.
+        info(2, "Switching to multiprocessor code.")
+        ncpus = kwargs['ncpus']; del kwargs['ncpus']
+        worker_kwargs = dict(kwargs); worker_kwargs['infolevel'] = 0
+
+        def guess_mod(data, arg):
+            p, kw, n = arg; hom = to_hom(p)
+            kw = dict(worker_kwargs, **kw)
+            if n is not None:
+                data = data[:n]
+            try:
+                data_mod = data.reduce(p) if isinstance(data, _TermStore) else map(hom, data)
+                Lp = guess(data_mod, A.change_ring(hom(K.one()).parent()[x]), **kw)
+            except ArithmeticError:
+                return None
+            if type(Lp) is tuple:
+                return op2residues(Lp[0]), Lp[1]
+            return op2residues(Lp), None
+
+        pool = WorkerPool(guess_mod, data, ncpus)
+
+    try:
+        while mod != 0:
+
+            nn += 1 # iteration counter
+
+            if nn == 1:
+                # 1st iteration: use the path specified by the user (or a default path)
+                kwargs['return_short_path'] = True
+
+            elif nn == 2 and atomic and path[0][0] >= Lp.order() + 2:
+                # 2nd iteration: try to optimize the path obtained in the 1st iteration 
+                r0 = Lp.order(); d0 = Lp.degree(); r1, d1 = path[0]
+                # determine the hyperbola through (r0,d0) and (r1,d1) and 
+                # choose (r2,d2) as the point on this hyperbola for which (r2+1)*(d2+1) is minimized
+                try: 
+                    r2 = r0 - 1 + math.sqrt(abs((d0-d1)*r0*(r0-1.-r1)/(d0+r0+d1*(r0-1.-r1)-r1)))
+                    d2 = (d1*(r0-1-r1)*(r0-r2) + d0*(r1-r2))/((r0-r1)*(r0-1-r2))
+                    r2 = int(math.ceil(r2)); d2 = int(math.ceil(d2))
+                    if abs(r2 - r1) >= 2 and abs(d2 - d1) >= 2:
+                        path = [ (i, d2 + ((d1-d2)*(i-r2))/(r1-r2)) for i in xrange(r2, r1, cmp(r1, r2)) ] + path
+                        kwargs['path'] = path
+                    else:
+                        del kwargs['return_short_path']
+                except:
                     del kwargs['return_short_path']
-            except:
-                del kwargs['return_short_path']
 
-            if A.is_C():
-                kwargs['path'] = [(Lp.order(), Lp.degree())] # there is no curve for algebraic equations
+                if A.is_C():
+                    kwargs['path'] = [(Lp.order(), Lp.degree())] # there is no curve for algebraic equations
 
-        elif kwargs.has_key('return_short_path'):
-            # subsequent iterations: stick to the path we have.                 
-            del kwargs['return_short_path']
+            elif kwargs.has_key('return_short_path'):
+                # subsequent iterations: stick to the path we have.                 
+                del kwargs['return_short_path']
 
-        if not kwargs.has_key('path'):
-            kwargs['return_short_path'] = True
+            if not kwargs.has_key('path'):
+                kwargs['return_short_path'] = True
 
-        if ncpus == 1:
-            # sequential version 
+            if pool is None:
+                # sequential version 
 
-            imgs = [];
-            for i in xrange(max(1, nn - 3)): # do several imgs before proceeding with a reconstruction attempt
+                imgs = []; batch = [ modulus.next() for i in xrange(max(1, nn - 3)) ]
+                if isinstance(data, _TermStore):
+                    data.prefetch(batch) # one pass over the digits for all moduli of this round
+                moduli = itertools.chain(batch, modulus)
+                for i in xrange(max(1, nn - 3)): # do several imgs before proceeding with a reconstruction attempt
                 
-                data_mod = None
-                while data_mod is None:
-                    p = modulus.next(); hom = to_hom(p)
-                    info(2, "modulus = " + str(p))
-                    try:
-                        data_mod = map(hom, data)
-                    except ArithmeticError:
-                        info(2, "unlucky modulus discarded.")
+                    data_mod = None
+                    while data_mod is None:
+                        p = moduli.next(); hom = to_hom(p)
+                        info(2, "modulus = " + str(p))
+                        try:
+                            data_mod = data.reduce(p) if isinstance(data, _TermStore) else map(hom, data)
+                        except ArithmeticError:
+                            info(2, "unlucky modulus discarded.")
 
-                qq = A.is_Q()
-                if not qq:
-                    Lp = guess(data_mod, A.change_ring(hom(K.one()).parent()[x]), **kwargs)
-                else:
-                    qq = hom(qq[1])
-                    Lp = guess(data_mod, OreAlgebra(hom(K.one()).parent()[x], (A.var(), {x:qq*x}, {}), q=qq), **kwargs)
+                    qq = A.is_Q()
+                    if not qq:
+                        Lp = guess(data_mod, A.change_ring(hom(K.one()).parent()[x]), **kwargs)
+                    else:
+                        qq = hom(qq[1])
+                        Lp = guess(data_mod, OreAlgebra(hom(K.one()).parent()[x], (A.var(), {x:qq*x}, {}), q=qq), **kwargs)
 
-                if type(Lp) is tuple and len(Lp) == 2:  ## this implies nn < 3  
-                    Lp, path = Lp
-                    kwargs['path'] = path
+                    if type(Lp) is tuple and len(Lp) == 2:  ## this implies nn < 3  
+                        Lp, path = Lp
+                        kwargs['path'] = path
 
-                imgs.append((Lp, p))
+                    imgs.append((Lp, p))
+
+                if len(imgs) == 1:
+                    Lp, p = imgs[0]
+                    r = Lp.order(); d = Lp.degree()
+                else:
+                    Lp, p = merge_images(imgs)
 
-            if len(imgs) == 1:
-                Lp, p = imgs[0]
-                r = Lp.order(); d = Lp.degree()
             else:
-                Lp = A.zero(); p = K.one()
-                for (Lpp, pp) in imgs:
+                # parallel version: all workers search along the same path, each modulo its own prime
+                kw = dict( (key, kwargs[key]) for key in ('path', 'return_short_path') if kwargs.has_key(key) )
+                imgs = []
+                while len(imgs) == 0:
+                    primes = [modulus.next() for i in xrange(ncpus)]
+                    info(2, "moduli = " + str(primes))
+                    for ((pp, _, _), res) in pool.map([ (pp, kw, nterms) for pp in primes ]):
+                        if res is None:
+                            info(2, "unlucky modulus " + str(pp) + " discarded")
+                            continue
+                        Rp = to_hom(pp)(K.one()).parent()[x]
+                        imgs.append((A.change_ring(Rp)(map(Rp, res[0])), pp, res[1]))
+
+                if nn == 1:
+                    # take the most frequent (order, degree) among the images; the others are unlucky
+                    shapes = [ (Lpp.order(), Lpp.degree()) for (Lpp, pp, _) in imgs ]
+                    r, d = max(sorted(set(shapes)), key=shapes.count)
+                    imgs = [ img for img in imgs if (img[0].order(), img[0].degree()) == (r, d) ]
+                for (_, _, short_path) in imgs:
+                    if short_path is not None:
+                        path = short_path; kwargs['path'] = path; break
+
+                Lp, p = merge_images([ (Lpp, pp) for (Lpp, pp, _) in imgs ])
+
+            if nn == 1:
+                r = Lp.order(); d = Lp.degree()
+                info(2, "solution of order " + str(r) + " and degree " + str(d) + " predicted")
+
+            if nn >= 2 and kwargs.get('cut') is not None and kwargs.has_key('path'):
+                # once the path is final (it may still change in the 2nd iteration), later images
+                # only need the terms required for the points on the path
+                needed = max((i + 1)*(j + 2) for (i, j) in kwargs['path'] + [(r, d)]) \
+                         + max(kwargs['cut'], kwargs.get('ensure', 0))
+                if len(data) > needed:
+                    info(2, "keeping only the first " + str(needed) + " terms")
+                    data = data[:needed]; nterms = needed
+
+            if nn == 3 and kwargs.has_key('infolevel'):
+                kwargs['infolevel'] = kwargs['infolevel'] - 2
+
+            if not Lp.is_zero():
+                info(2, "Reconstruction attempt...")
+                s = Lp.parent().sigma()
+                if not s.is_identity() and mod.parent() is ZZ:
                     try:
-                        Lp, p = _merge_homomorphic_images(op2vec(Lp, r, d), p, op2vec(Lpp, r, d), pp, reconstruct=False)
-                        Lp = vec2op(Lp, r, d)
+                        if order_adjustment is None:
+                            order_adjustment = Lp.order() // ZZ(2)
+                        Lp = Lp.map_coefficients(lambda p: s(p, -order_adjustment))
                     except:
-                        info(2, "unlucky modulus " + str(pp) + " discarded")
+                        L = A.zero(); mod = K.one() if atomic else ZZ.one(); order_adjustment = 0
 
-        else:
-            # we can assume at this point that nn >= 3 and 'return_short_path' is switched off.
-            primes = [modulus.next() for i in xrange(ncpus)]
-            info(2, "moduli = " + str(primes))
-            primes = [ (p, to_hom(p)) for p in primes ]
-            primes = [ (p, hom, A.change_ring(hom(K.one()).parent()[x])) for (p, hom) in primes ]
-            Lp = A.zero(); p = K.one()
-            out = [ (arg[0][0], arg[0][2], Lpp) for (arg, Lpp) in forked_guess(primes) ]
-            for (pp, alg, Lpp) in out:
-                Lpp = alg(Lpp)
-                try:
-                    Lp, p = _merge_homomorphic_images(op2vec(Lp, r, d), p, vec2op(Lpp, r, d), pp, reconstruct=False)
-                    Lp = vec2op(Lp, r, d)
-                except:
-                    info(2, "unlucky modulus " + str(pp) + " discarded")
+                L0, mod0 = L, mod
+                L, mod = _merge_homomorphic_images(op2vec(L, r, d), mod, op2vec(Lp, r, d), p, margin=margin)
+                L = vec2op(L, r, d)
 
-        if nn == 1:
-            r = Lp.order(); d = Lp.degree()
-            info(2, "solution of order " + str(r) + " and degree " + str(d) + " predicted")
-
-        elif nn == 2 and kwargs.has_key('ncpus') and kwargs['ncpus'] > 1:
-            info(2, "Switching to multiprocessor code.")
-            ncpus = kwargs['ncpus']
-            del kwargs['ncpus']
-            kwargs['infolevel'] = 0
-            
-            @parallel(ncpus=ncpus)
-            def forked_guess(p, hom, alg):
-                try:
-                    return guess(map(hom, data), alg, **kwargs).polynomial()
-                except ArithmeticError:
-                    return None
-                
-        elif nn == 3 and kwargs.has_key('infolevel'):
-            kwargs['infolevel'] = kwargs['infolevel'] - 2
-
-        if not Lp.is_zero():
-            info(2, "Reconstruction attempt...")
-            s = Lp.parent().sigma()
-            if not s.is_identity() and mod.parent() is ZZ:
-                try:
-                    if order_adjustment is None:
-                        order_adjustment = Lp.order() // ZZ(2)
-                    Lp = Lp.map_coefficients(lambda p: s(p, -order_adjustment))
-                except:
-                    L = A.zero(); mod = K.one() if atomic else ZZ.one(); order_adjustment = 0
-
-            L, mod = _merge_homomorphic_images(op2vec(L, r, d), mod, op2vec(Lp, r, d), p)
-            L = vec2op(L, r, d)
+                if verify and mod == 0 and not check(L):
+                    # premature reconstruction: keep the chinese remainder image and continue
+                    info(2, "verification failed.")
+                    L, mod = _merge_homomorphic_images(op2vec(L0, r, d), mod0, op2vec(Lp, r, d), p, reconstruct=False)
+                    L = vec2op(L, r, d)
+    finally:
+        if pool is not None:
+            pool.close()
 
     if order_adjustment > 0:
         s = L.parent().sigma()
@@ -688,6 +862,18 @@ def _guess_via_gcrd(data, A, **kwargs):
     - ``L`` in ``A``, the guessed operator.
 
     raises an error if no equation is found.
+
+    EXAMPLES::
+
+      sage: from ore_algebra import *
+      sage: from ore_algebra.guessing import _guess_via_gcrd
+      sage: from ore_algebra.nullspace import sage_native
+      sage: K = GF(1091); R.<n> = K['n']; A = OreAlgebra(R, 'Sn')
+      sage: data = [K(binomial(2*k, k)) for k in xrange(100)]
+      sage: L = _guess_via_gcrd(data, A); L
+      (n + 1)*Sn + 1087*n + 1089
+      sage: L == _guess_via_gcrd(data, A, solver=sage_native) # via guess_raw
+      True
     """
 
     if kwargs.has_key('infolevel'):
@@ -766,16 +952,42 @@ def _guess_via_gcrd(data, A, **kwargs):
 
     # search equation
 
-    subguesser = guess_hp if A.is_C() else guess_raw
-    neg_probes = []
+    if A.is_C() or (A.is_S() and K.characteristic() > len(data) and kwargs.get('solver') is None):
+        # approximants of minimal degree via order bases. A solver given by the user is respected
+        # for recurrences by falling back to guess_raw; for algebraic equations it is ignored.
+        def subguesser(data, A, **kwargs):
+            # guess_hp returns minimal generators of the K[x]-module of solutions, but the search
+            # below counts solutions and restricts degrees in terms of a K-basis. By the predictable
+            # degree property of the generators, the x^k*L with deg(x^k*L) <= degree form such a basis.
+            x = A.base_ring().gen(); d = kwargs['degree']
+            return [ x**k*L for L in guess_hp(data, A, **kwargs) for k in xrange(d - L.degree() + 1) ]
+        if kwargs.has_key('solver'):
+            del kwargs['solver']
+    else:
+        subguesser = guess_raw
+    if subguesser is guess_raw:
+        kwargs['ansatz'] = dict() # all probes extract their matrices from the same columns
+    neg_probes = []; pos_probes = dict()
+    cut = kwargs['cut'] if kwargs.has_key('cut') else 25 # default of guess_raw and guess_hp
+    def rows(r, d):
+        # number of terms the subguesser uses for (r, d)
+        return len(data) if cut is None else min(len(data), (r + 1)*(d + 2) + cut)
     def probe(r, d):
         if (r, d) in neg_probes:
-            return []        
-        kwargs['order'], kwargs['degree'] = r, d
-        sols = subguesser(data, A, **kwargs)
+            return []
+        bigger = [ d1 for (r1, d1) in pos_probes if r1 == r and d1 > d and rows(r, d1) == rows(r, d) ]
+        if len(bigger) > 0:
+            # a probe for a bigger degree used the same terms, so its solutions of degree <= d
+            # span the same space as those of a probe for (r, d)
+            sols = _restrict_degree(pos_probes[r, min(bigger)], d)
+        else:
+            kwargs['order'], kwargs['degree'] = r, d
+            sols = subguesser(data, A, **kwargs)
         info(2, str(len(sols)) + " sols for (r, d)=" + str((r, d)))
         if len(sols) == 0:
             neg_probes.append((r, d))
+        else:
+            pos_probes[r, d] = sols
         return sols
 
     L = []; short_path = []; 
@@ -829,6 +1041,151 @@ def _guess_via_gcrd(data, A, **kwargs):
 
     return (L, short_path) if return_short_path else L
 
+def _restrict_degree(sols, d):
+    """
+    Returns a basis of the operators of degree at most ``d`` in the span of the given operators,
+    normalized in the same way as the output of ``guess_raw``.
+    """
+    A = sols[0].parent(); K = A.base_ring().base_ring()
+    r = max(L.order() for L in sols); D = max(L.degree() for L in sols)
+    if D <= d:
+        return sols
+    high = matrix(K, [ [ L[j][e] for j in xrange(r + 1) for e in xrange(d + 1, D + 1) ] for L in sols ])
+    sols = [ sum(c*L for (c, L) in zip(v, sols)) for v in high.left_kernel().basis() ]
+    return [ (~L.leading_coefficient().leading_coefficient())*L for L in sols ]
+
+###########################################################################################
+
+class _TermStore(object):
+    r"""
+    Read-only sequence of integer or rational terms, kept as a buffer of decimal digits.
+
+    The terms are read from a text file with one term per line, which is memory mapped, or from an
+    iterable, whose items are written to an anonymous temporary file one at a time. Terms are only
+    turned into Sage objects when they are accessed individually. Images modulo word size primes are
+    computed from the digits directly, for several primes in one pass, and cached as ``numpy``
+    arrays until they are requested by ``reduce``. Slicing returns a store on the same buffer.
+
+    The constructor raises a ``ValueError`` if the source contains something else than integers
+    or quotients of integers.
+    """
+
+    _chunk = 9 # number of decimal digits combined into one machine word
+
+    def __init__(self, source, _view=None):
+        import numpy
+
+        if _view is not None:
+            self._buffer, self._raw, self._starts, self._stops = _view
+            self._cache = dict()
+            return
+
+        if isinstance(source, str):
+            f = open(source, 'rb')
+        else:
+            f = tempfile.TemporaryFile()
+            for t in source:
+                f.write(t if isinstance(t, str) else str(QQ(t)))
+                f.write('\n')
+            f.flush()
+
+        try:
+            if os.fstat(f.fileno()).st_size == 0:
+                self._buffer = None; raw = numpy.zeros(0, dtype=numpy.uint8)
+            else:
+                self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                raw = numpy.frombuffer(self._buffer, dtype=numpy.uint8)
+        finally:
+            f.close()
+
+        # allowed: digits, signs, fraction bars, and white space
+        allowed = numpy.zeros(256, dtype=bool)
+        allowed[ord('0'):ord('9') + 1] = True
+        for c in '+-/ \t\r\n':
+            allowed[ord(c)] = True
+        if not allowed[raw].all():
+            raise ValueError("terms are not given as integers or quotients of integers")
+
+        digit = (raw >= ord('0')) & (raw <= ord('9'))
+        ends = numpy.flatnonzero(raw == ord('\n'))
+        starts = numpy.concatenate(([0], ends + 1)); stops = numpy.concatenate((ends, [len(raw)]))
+        # discard blank lines
+        count = numpy.concatenate(([0], numpy.cumsum(digit)))
+        nonblank = count[stops] > count[starts]
+        self._raw = raw; self._starts = starts[nonblank]; self._stops = stops[nonblank]
+        self._cache = dict()
+
+    def __len__(self):
+        return len(self._starts)
+
+    def _line(self, i):
+        return self._raw[self._starts[i]:self._stops[i]].tobytes()
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return _TermStore(None, _view=(self._buffer, self._raw, self._starts[i], self._stops[i]))
+        if i < 0:
+            i += len(self)
+        return QQ(self._line(i).strip())
+
+    def __iter__(self):
+        for i in xrange(len(self)):
+            yield self[i]
+
+    def _digits_mod(self, digits, primes, powers):
+        # residues of the integer with the given ascii digits (a numpy array) modulo the given primes,
+        # using the table of powers of 10^_chunk modulo the primes
+        import numpy
+        c = self._chunk
+        digits = digits[(digits >= ord('0')) & (digits <= ord('9'))].astype(numpy.int64) - ord('0')
+        digits = numpy.concatenate((numpy.zeros((-len(digits)) % c, dtype=numpy.int64), digits))
+        words = digits.reshape((-1, c)).dot(10**numpy.arange(c - 1, -1, -1, dtype=numpy.int64))
+        if len(words) == 0:
+            return numpy.zeros(len(primes), dtype=numpy.int64)
+        return ((words[None, :]*powers[:, -len(words):]) % primes[:, None]).sum(axis=1) % primes
+
+    def prefetch(self, primes):
+        r"""
+        Computes the residues of all terms modulo the given primes (which must be smaller than `2^{31}`)
+        in a single pass over the buffer. Zero denominators are marked by `-1`.
+        """
+        import numpy
+        primes = [ p for p in primes if p not in self._cache ]
+        if len(primes) == 0 or len(self) == 0:
+            for p in primes:
+                self._cache[p] = numpy.zeros(0, dtype=numpy.int64)
+            return
+        P = numpy.array([ int(p) for p in primes ], dtype=numpy.int64)
+        width = int((self._stops - self._starts).max())//self._chunk + 1
+        powers = numpy.ones((len(primes), width), dtype=numpy.int64)
+        step = 10**self._chunk % P
+        for j in xrange(width - 2, -1, -1):
+            powers[:, j] = (powers[:, j + 1]*step) % P
+        out = numpy.zeros((len(primes), len(self)), dtype=numpy.int64)
+        for i in xrange(len(self)):
+            line = self._raw[self._starts[i]:self._stops[i]]
+            bar = numpy.flatnonzero(line == ord('/'))
+            num = self._digits_mod(line if len(bar) == 0 else line[:bar[0]], P, powers)
+            if (line == ord('-')).sum() % 2 == 1:
+                num = (-num) % P
+            if len(bar) > 0:
+                den = self._digits_mod(line[bar[0] + 1:], P, powers)
+                num = numpy.where(den == 0, -1, (num*_pow_mod(den, P - 2, P)) % P)
+            out[:, i] = num
+        for k in xrange(len(primes)):
+            self._cache[primes[k]] = out[k].copy()
+
+    def reduce(self, p):
+        r"""
+        Returns the list of images of the terms in `GF(p)` and drops the cached residues modulo `p`.
+        Raises a ``ZeroDivisionError`` if some denominator vanishes modulo `p`.
+        """
+        self.prefetch([p])
+        res = self._cache.pop(p)
+        if (res < 0).any():
+            raise ZeroDivisionError("denominator vanishes modulo " + str(p))
+        return map(GF(p), res.tolist())
+
 ###########################################################################################
 
 from sage.arith.multi_modular import MAX_MODULUS
@@ -856,7 +1213,7 @@ def _linear_polys(x, init=7, bound=None):
 
 ###########################################################################################
 
-def _merge_homomorphic_images(v, mod, vp, p, reconstruct=True):
+def _merge_homomorphic_images(v, mod, vp, p, reconstruct=True, margin=None):
     """
     Interpolation or chinese remaindering on the coefficients of operators.
 
@@ -871,6 +1228,9 @@ def _merge_homomorphic_images(v, mod, vp, p, reconstruct=True):
       gives `vp` when its coeffs are reduced mod ``p``.
     - ``reconstruct`` (default: ``True``) -- if set to ``False``, only 
       do Chinese remaindering, but no rational reconstruction.       
+    - ``margin`` (default: ``None``) -- passed on to ``_rat_recon``; for integer
+      moduli, a reconstructed fraction `p/q` is only accepted if `|p*q|` is smaller
+      than the modulus divided by ``margin``.
 
     OUTPUT:
 
@@ -919,16 +1279,15 @@ def _merge_homomorphic_images(v, mod, vp, p, reconstruct=True):
             p = R.base_ring()(p)
             mod = R.base_ring()(mod)
 
-        # cra / interpolation
+        # cra / interpolation, on the whole vectors at once
 
         (_, mod0, p0) = p.xgcd(mod)
         mod0 = R(mod0*p); p0 = R(p0*mod)
 
-        coords = []
-        for i in xrange(len(v)):
-            coords.append(mod0*v[i] + p0*B(vp[i]))
-
-        vmod = vector(R, coords)
+        # coordinates of vp are lifted into the parent of v one by one, as change_ring may keep
+        # residues whose arithmetic with v is not defined
+        vp = vector(B, [ B(c) for c in vp ])
+        vmod = vector(R, mod0*v + p0*vp)
         mod *= p
 
     if not reconstruct:
@@ -952,9 +1311,9 @@ def _merge_homomorphic_images(v, mod, vp, p, reconstruct=True):
             c = coords[i]
             if poly:
                 for l in xrange(c.degree(), -1, -1): 
-                    d *= _rat_recon(d*c[l], mod)[1]
+                    d *= _rat_recon(d*c[l], mod, margin=margin)[1]
             else:
-                d *= _rat_recon(d*c, mod)[1]
+                d *= _rat_recon(d*c, mod, margin=margin)[1]
     except (ArithmeticError, ValueError):
         return vmod, mod # reconstruction failed
 
@@ -968,13 +1327,41 @@ def _merge_homomorphic_images(v, mod, vp, p, reconstruct=True):
 
     return v.parent()(coords), R.zero()
 
+def _crt_tree(vectors, moduli):
+    """
+    Chinese remaindering or interpolation of several vectors at once.
+
+    Returns a pair `(v, m)` where `m` is the product of the given pairwise coprime ``moduli``
+    and `v` is a vector which agrees with ``vectors[i]`` modulo ``moduli[i]`` for every `i`.
+    The images are combined pairwise along a product tree over the moduli, so that every
+    coordinate takes part in a logarithmic number of combination steps, each of which is
+    carried out with vector operations. The base rings and moduli are as for
+    ``_merge_homomorphic_images``.
+    """
+    if len(vectors) == 1:
+        return vectors[0], moduli[0]
+
+    k = len(vectors)//2
+    v1, m1 = _crt_tree(vectors[:k], moduli[:k])
+    v2, m2 = _crt_tree(vectors[k:], moduli[k:])
+    B = v1.base_ring()
+
+    if B is ZZ or B.characteristic() > 0:
+        # reduced representatives: v1 + m1*((v2 - v1)/m1 mod m2)
+        w = (v2 - v1)*m1.inverse_mod(m2)
+        return v1 + m1*vector(B, [ c % m2 for c in w ]), m1*m2
+    else:
+        # coefficients in ZZ[q], moduli in ZZ
+        (_, s, t) = m1.xgcd(m2)
+        return (t*m2)*v1 + (s*m1)*v2, m1*m2
+
 ###########################################################################################
 
-def _rat_recon(a, m, u=None):
+def _rat_recon(a, m, u=None, margin=None):
     """
     if m.parent() is ZZ:
 
-      find (p, q) such that a == p/q mod m and abs(p*q) < m/1000
+      find (p, q) such that a == p/q mod m and abs(p*q) < m/margin (default: margin=10000)
       if u is not None, require abs(q) <= u.
       raises ArithmeticError if no p/q is found.
       if m < 1000000, we use sage's builtin
@@ -992,8 +1379,10 @@ def _rat_recon(a, m, u=None):
     
     if K is ZZ:
         score_fun = lambda p, q: abs(p*q)
-        bound = m // ZZ(10000)
-        early_termination_bound = m // ZZ(1000000)
+        if margin is None:
+            margin = ZZ(10000)
+        bound = m // margin
+        early_termination_bound = m // (100*margin)
         if u is None:
             u = m
     else:
@@ -105,24 +105,27 @@ input domains, and the input domains of the subsolvers they require.
 The notation `K[x,...]` refers to univariate or multivariate polynomial ring, understanding the same
 reading (unvariate vs. multivariate) in corresponding rows of the 2nd and 3rd column.
 
-  =============== ================================================== ========================
-  method           input domain                                      requires subsolver for
-  =============== ================================================== ========================
-  cra_            `K[x,...]` where `K` is `ZZ`, `QQ`, or `GF(p)`     `GF(p)[x,...]`
-  galois_         `QQ(alpha)[x,...]`                                 `GF(p)[x,...]`
-  clear_          `K(x,...)`                                         `K[x,...]`
-  clear_          `K[x,...]` where `K` is the fraction field of `R`  `R[x,...]`
-  compress_       `K[x,...]` or `K(x,...)`                           same domain and `GF(p)`
-  kronecker_      `K[x,...]`                                         `K[x]` and `GF(p)[x]`
-  gauss_          `K[x,...]`                                         None
-  wiedemann_      `K[x,...]` or `K(x,...)`                           None
-  lagrange_       `K[x]` or `K(x)` where `K` is a field              `K`
-  hermite_        `K[x]` where `K` is a field                        None
-  newton_         `K[x]` where `K` is a field                        `K`
-  merge_          `K[x,...][y,...]`                                  `K[x,...,y,...]`
-  `quick_check`_  `K[x,...]` where `K` is `ZZ`, `QQ`, or `GF(p)`     same domain and `GF(p)`
-  `sage_native`_  `K[x,...]` or `K(x,...)` or `K`                    None
-  =============== ================================================== ========================
+  ================== ================================================== ========================
+  method             input domain                                       requires subsolver for
+  ================== ================================================== ========================
+  cra_               `K[x,...]` where `K` is `ZZ`, `QQ`, or `GF(p)`     `GF(p)[x,...]`
+  galois_            `QQ(alpha)[x,...]`                                 `GF(p)[x,...]`
+  clear_             `K(x,...)`                                         `K[x,...]`
+  clear_             `K[x,...]` where `K` is the fraction field of `R`  `R[x,...]`
+  compress_          `K[x,...]` or `K(x,...)`                           same domain and `GF(p)`
+  kronecker_         `K[x,...]`                                         `K[x]` and `GF(p)[x]`
+  gauss_             `K[x,...]`                                         None
+  wiedemann_         `K[x,...]` or `K(x,...)`                           None
+  `block_wiedemann`_ `K` where `K` is a field                           None
+  lagrange_          `K[x]` or `K(x)` where `K` is a field              `K`
+  hermite_           `K[x]` where `K` is a field                        None
+  newton_            `K[x]` where `K` is a field                        `K`
+  merge_             `K[x,...][y,...]`                                  `K[x,...,y,...]`
+  `quick_check`_     `K[x,...]` where `K` is `ZZ`, `QQ`, or `GF(p)`     same domain and `GF(p)`
+  `sage_native`_     `K[x,...]` or `K(x,...)` or `K`                    None
+  `numpy_native`_    `GF(p)`                                            None
+  auto_              `K[x,...]` where `K` is `ZZ` or `GF(p)`            None
+  ================== ================================================== ========================
 
 AUTHOR:
 
@@ -137,10 +140,13 @@ AUTHOR:
 .. _newton : #nullspace.newton
 .. _lagrange : #nullspace.lagrange
 .. _`sage_native` : #nullspace.sage_native
+.. _`numpy_native` : #nullspace.numpy_native
 .. _wiedemann : #nullspace.wiedemann
+.. _`block_wiedemann` : #nullspace.block_wiedemann
 .. _merge : #nullspace.merge
 .. _galois : #nullspace.galois
 .. _`quick_check` : #nullspace.quick_check
+.. _auto : #nullspace.auto
  
 """
 
@@ -157,7 +163,6 @@ AUTHOR:
 """ todo:
 
 * hensel: Z[x..] to Z_p[x..] with p-adic lifting and subsolver
-* galois: QQ(alpha)[x..] to Zp[x..]
 * schur: block-wise recursive gaussian elimination?
 * preconditioners?
 
@@ -187,8 +192,10 @@ from sage.arith.multi_modular import MAX_MODULUS
 from sage.parallel.decorate import parallel
 from sage.matrix.constructor import Matrix, matrix
 from sage.modules.free_module_element import vector
+from .tools import WorkerPool
 from datetime import datetime
 import math
+import time
 
 #####################
 ####### tools #######
@@ -201,6 +208,10 @@ class NoSolution(ArithmeticError):
     
     def __str__(self):
         return "no solution"
+
+class UnluckyPoint(ValueError):
+    # used in evaluation/interpolation solvers to indicate that the rank drops at some evaluation point
+    pass
     
 def heuristic_row_content(row, ring):
     # used in nullspace_gauss
@@ -355,6 +366,75 @@ def _pivot(mat, r, n, c, m, zero):
     del piv_cand
     return (pivot[0] + r, pivot[1] + c)
 
+def _sparse_pivot(rows, col_rows, row_bucket, col_bucket, zero):
+    """
+    Sparse counterpart of _pivot. ``rows`` is a list of dictionaries mapping column indices to the
+    nonzero entries of the row, and ``col_rows[j]`` is the set of indices of the active rows which
+    have a nonzero entry in column `j`. ``row_bucket[k]`` (resp. ``col_bucket[k]``) is the set of
+    active rows (resp. columns) with exactly `k` nonzero entries; empty buckets are not stored.
+    Returns the index (i, j) of the suggested pivot, or None if all active rows are zero.
+
+    The pivot minimizes the Markowitz cost (number of nonzero entries in row i minus one times number
+    of nonzero entries in column j minus one). Rows and columns are visited in the order of increasing
+    counts, and the search stops as soon as no unvisited entry can have a smaller cost: once all rows
+    and columns with fewer than `k` entries have been visited, every remaining entry has cost at least
+    `(k-1)^2`.
+    Ties are broken in favor of pivots with few terms.
+    """
+
+    def size(el):
+        try:
+            return len(el.coefficients())
+        except:
+            return 1
+
+    best = [None, None, None] # pivot, cost, size
+    def consider(i, j, w):
+        if best[0] is None or w < best[1]:
+            best[0] = (i, j); best[1] = w; best[2] = None
+        elif w == best[1]:
+            if best[2] is None:
+                best[2] = size(rows[best[0][0]][best[0][1]])
+            s = size(rows[i][j])
+            if s < best[2]:
+                best[0] = (i, j); best[2] = s
+
+    for k in sorted(set(row_bucket) | set(col_bucket)):
+        if best[0] is not None and best[1] < (k - 1)**2:
+            break # every unvisited entry has at least k entries in its row and in its column
+        for j in col_bucket.get(k, ()):
+            for i in col_rows[j]:
+                w = (len(rows[i]) - 1)*(k - 1)
+                if w == 0:
+                    return (i, j) # early termination: row or column with only one nonzero entry
+                consider(i, j, w)
+        for i in row_bucket.get(k, ()):
+            for j in rows[i]:
+                w = (k - 1)*(len(col_rows[j]) - 1)
+                if w == 0:
+                    return (i, j) # early termination: row or column with only one nonzero entry
+                consider(i, j, w)
+
+    return best[0]
+
+def _sparse_rebucket(bucket, count, idx, k):
+    """
+    Moves the row or column ``idx`` into ``bucket[k]``, removing it from the bucket given by ``count[idx]``.
+    For k == 0, it is only removed.
+    """
+    old = count.pop(idx, 0)
+    if old == k:
+        if k > 0:
+            count[idx] = k
+        return
+    if old > 0:
+        b = bucket[old]; b.discard(idx)
+        if not b:
+            del bucket[old]
+    if k > 0:
+        count[idx] = k
+        bucket.setdefault(k, set()).add(idx)
+
 def _leading_coefficient(p):
     try:
         return p.leading_coefficient() ## good for univariate polynomials
@@ -471,7 +551,114 @@ def sage_native(mat, degrees=[], infolevel=0):
     _launch_info(infolevel, "sage_native", dim=mat.dimensions(), domain=mat.parent().base_ring())
     return _normalize([v for v in mat.right_kernel_matrix()])
 
-def gauss(pivot=_pivot, ncpus=1, fun=None):
+def numpy_native(mat, degrees=[], infolevel=0):
+    r"""
+    Computes the nullspace of a matrix over `GF(p)` by elimination on an array of machine integers.
+
+    INPUT:
+
+    - ``mat`` -- a matrix over a prime field `GF(p)` with `2 < p < 2^{31}`; for other matrices,
+      the computation is delegated to `sage_native`_
+    - ``degrees`` -- ignored
+    - ``infolevel`` -- a nonnegative integer indicating the desired verbosity.
+
+    OUTPUT:
+
+    - a list of vectors that form a basis of the right kernel of ``mat``, in the same normal form
+      as the output of `sage_native`_
+
+    EXAMPLES::
+
+       sage: from ore_algebra.nullspace import numpy_native, sage_native
+       sage: A = MatrixSpace(GF(1093), 4, 7).random_element()
+       sage: V = numpy_native(A)
+       sage: A*V[0]
+       (0, 0, 0, 0)
+       sage: V == sage_native(A)
+       True
+       sage: numpy_native(matrix(GF(7), [[1, 2], [2, 4]]))
+       [(1, 3)]
+       sage: numpy_native(matrix(GF(7), [[1, 0], [0, 1]]))
+       []
+
+    ALGORITHM: The matrix is converted into a ``numpy`` array of type ``int64`` and brought into reduced
+    echelon form. As long as the entries cannot overflow, the updates of the rows are not reduced
+    modulo `p`. Only the pivot column and the pivot row are reduced in each step. The kernel basis is
+    read off from the echelon form and echelonized in the same way. 
+
+    """
+    R = mat.parent().base_ring(); p = R.characteristic()
+    _launch_info(infolevel, "numpy_native", dim=mat.dimensions(), domain=R)
+
+    if not (R.is_prime_field() and 2 < p < 2**31):
+        return sage_native(mat, degrees=degrees, infolevel=_alter_infolevel(infolevel, -1, 1))
+
+    import numpy
+    (n, m) = mat.dimensions()
+    A = numpy.array(mat.numpy(), dtype=numpy.int64).reshape((1, n, m))
+    try:
+        V = _kernel_mod_p(A, p)[0]
+    except NoSolution:
+        return []
+    return [ v for v in matrix(R, V) ]
+
+def _rref_mod_p(A, p):
+    # reduced row echelon forms of a stack of matrices over GF(p), p < 2^31, given as numpy array of
+    # shape (N, n, m); returns the echelon forms, the boolean (N, m)-array of pivot columns and the ranks.
+    # Row updates are accumulated without reduction as long as they cannot exceed 63 bits.
+    import numpy
+
+    N, n, m = A.shape
+    A = A % p; rows = numpy.arange(n); bound = p - 1; limit = 2**63 - 1
+    rank = numpy.zeros(N, dtype=numpy.int64); pivots = numpy.zeros((N, m), dtype=bool)
+    for c in xrange(m):
+        A[:, :, c] %= p
+        cand = (A[:, :, c] != 0) & (rows[None, :] >= rank[:, None])
+        found = numpy.flatnonzero(cand.any(axis=1))
+        if len(found) == 0:
+            continue
+        r = rank[found]; piv = cand[found].argmax(axis=1)
+        row = A[found, piv, :] % p
+        A[found, piv, :] = A[found, r, :]
+        row = (row*_pow_mod(row[:, c], p - 2, p)[:, None]) % p
+        A[found, r, :] = row
+        if bound + (p - 1)**2 > limit:
+            A %= p; bound = p - 1
+        factors = A[found, :, c].copy(); factors[numpy.arange(len(found)), r] = 0
+        A[found] -= factors[:, :, None]*row[:, None, :]
+        bound += (p - 1)**2
+        pivots[found, c] = True; rank[found] += 1
+    return A % p, pivots, rank
+
+def _kernel_mod_p(A, p):
+    # kernel bases of a stack of matrices over GF(p), p < 2^31, in echelon form. If one of the matrices
+    # has full column rank, NoSolution is raised, because then so has the generic matrix. Otherwise, all
+    # matrices are expected to have the same pivot columns, and UnluckyPoint is raised if they don't.
+    import numpy
+
+    N, n, m = A.shape
+    A, pivots, rank = _rref_mod_p(A, p)
+    r = rank.max() if N > 0 else 0
+    if r == m and m > 0:
+        raise NoSolution
+    if (rank < r).any() or (pivots != pivots[0]).any():
+        raise UnluckyPoint("unlucky evaluation point")
+    V = numpy.zeros((N, m - r, m), dtype=numpy.int64)
+    pivcols = numpy.flatnonzero(pivots[0]); free = numpy.flatnonzero(~pivots[0])
+    V[:, numpy.arange(m - r), free] = 1
+    V[:, :, pivcols] = (-A[:, :r, :][:, :, free]).transpose((0, 2, 1)) % p
+    return _rref_mod_p(V, p)[0]
+
+def _pow_mod(a, e, p):
+    # elementwise a^e mod p for a numpy int64 array a and p < 2^31; e and p may be arrays as well
+    import numpy
+    result = a*0 + 1; a = a % p; e = numpy.asarray(e, dtype=numpy.int64)
+    while (e > 0).any():
+        result = numpy.where(e & 1, (result*a) % p, result)
+        a = (a*a) % p; e = e >> 1
+    return result
+
+def gauss(pivot=_pivot, ncpus=1, fun=None, sparse=False):
     r"""
     Creates a solver based on fraction free gaussian elimination.
  
@@ -494,6 +681,13 @@ def gauss(pivot=_pivot, ncpus=1, fun=None):
       for analyzing the elimination process, e.g., for inspecting how well the solver succees in maintaining
       the sparsity of the matrix. The solver assumes that the function won't modify the matrix. 
 
+    - ``sparse`` -- if ``True``, the rows of the matrix are stored as dictionaries containing only their
+      nonzero entries, and the number of nonzero entries in each column is updated incrementally after
+      each elimination step. Elimination then only touches nonzero entries, and the pivot search
+      (Markowitz's rule) does not have to rescan the matrix. In this mode, ``pivot`` is ignored, and
+      ``fun`` receives the list of rows (as dictionaries) instead of a list of lists.
+      This is preferable for matrices with few nonzero entries, such as those arising in guessing. 
+
     OUTPUT:
 
     - A solver based on fraction free gaussian elimination.
@@ -507,11 +701,30 @@ def gauss(pivot=_pivot, ncpus=1, fun=None):
        sage: A*V[0]
        (0, 0, 0, 0)
 
+    If ``ncpus`` is larger than one, the updates of the rows affected by an elimination step,
+    including the removal of their content, are distributed among ``ncpus`` processes.
+
+    ::
+
+       sage: A = MatrixSpace(ZZ['x'], 20, 22).random_element(degree=2)
+       sage: V = gauss(ncpus=2)(A)
+       sage: V == gauss()(A)
+       True
+
+    Sparse matrices are best handled with ``sparse=True``::
+
+       sage: A = MatrixSpace(ZZ['x'], 30, 33, sparse=True).random_element(density=0.1)
+       sage: V = gauss(sparse=True)(A)
+       sage: len(V) == 33 - A.rank() and all(A*v == 0 for v in V)
+       True
+
     ALGORITHM: fraction-free gaussian elimination with heuristic content removal and Markoviz pivot search.
     """
     def gauss_solver(mat, degrees=[], infolevel=0):
         r"""See docstring of gauss() for further information"""
         
+        if sparse:
+            return _gauss_sparse(ncpus, fun, mat, degrees, infolevel)
         return _gauss(pivot, ncpus, fun, mat, degrees, infolevel)
     return gauss_solver    
 
@@ -523,9 +736,6 @@ def _gauss(pivot, ncpus, fun, mat, degrees, infolevel):
     n, m = mat.dimensions(); R = mat.parent().base_ring(); x = R.gen(); zero = R.zero(); one = R.one()
     _launch_info(infolevel, "gauss", dim=(n, m), domain=R)
 
-    if ncpus > 1:
-        print "Parallel gaussian elimination not yet implemented. Proceeding sequentially..."
-
     if n == 0:
         return [vector(R, v) for v in VectorSpace(QQ, m).basis()]
     mat = filter(any, [ [ R(el) for el in row ] for row in mat ] ) # discard zero rows.
@@ -534,6 +744,33 @@ def _gauss(pivot, ncpus, fun, mat, degrees, infolevel):
     r = 0; # current row
     cancel_constants = (R.characteristic() == 0)
 
+    pool = None
+    if ncpus > 1:
+        # One pool of workers serves the whole elimination. The workers receive the pivot row
+        # together with the rows to be processed, perform steps 2 to 4 on them, and send back
+        # the updated rows. The common content of step 3 is taken over the rows of a chunk only,
+        # so that each row travels to a worker and back only once per pivot.
+        def update_rows(data, arg):
+            chunk, matr, rows, c = arg
+            for row in rows:
+                _gauss_eliminate_row(matr, row, c, m, zero, one)
+            g = _gauss_common_content(rows, c, m, R, zero, one, cancel_constants)
+            for row in rows:
+                _gauss_cancel_row_content(row, g, c, m, R, zero, one, cancel_constants)
+            return rows
+
+        def process_rows(rows, r, c):
+            chunks = [ rows[k::ncpus] for k in xrange(ncpus) ]
+            args = [ (chunk, mat[r], [ mat[i] for i in chunk ], c) for chunk in chunks if chunk ]
+            for (arg, result) in pool.map(args):
+                chunk = arg[0]
+                if result is None or len(result) != len(chunk):
+                    raise ValueError("worker failed on rows " + str(chunk))
+                for i, row in zip(chunk, result):
+                    mat[i] = row
+
+        pool = WorkerPool(update_rows, None, ncpus)
+
     col_perm = {} # col_perm[i] == j means that the current column i corresponds to the original column j
     for j in xrange(m):
         col_perm[j] = j
@@ -541,61 +778,47 @@ def _gauss(pivot, ncpus, fun, mat, degrees, infolevel):
     _info(infolevel, "forward elimination...", alter = -1)
 
     # forward elimination
-    for c in xrange(m):
+    try:
+        for c in xrange(m):
 
-        _info(infolevel, "column", c, "out of", m, "...", alter = -2)
+            _info(infolevel, "column", c, "out of", m, "...", alter = -2)
 
-        if fun is not None:
-            fun(mat, c)
+            if fun is not None:
+                fun(mat, c)
 
-        # 1. choose a "good" pivot 
-        p = pivot(mat, r, n, c, m, zero)
-        if p is None:
-            break
-        (pr, pc) = p
-        
-        mat[r], mat[pr] = mat[pr], mat[r]
-        for i in xrange(n):
-            mati = mat[i]
-            mati[c], mati[pc] = mati[pc], mati[c]
-        col_perm[c], col_perm[pc] = col_perm[pc], col_perm[c]
+            # 1. choose a "good" pivot 
+            p = pivot(mat, r, n, c, m, zero)
+            if p is None:
+                break
+            (pr, pc) = p
         
-        # 2. perform elimination
-        affected_rows = []
-        for i in xrange(r + 1, n):
-            if mat[i][c] != zero:
-                affected_rows.append(i); matr = mat[r]; piv = matr[c]; mati = mat[i]; elim = mati[c]
-                try: 
-                    g = gcd(piv, elim)
-                    if g != one:
-                        piv //= g; elim //= g
-                    del g
-                except:
-                    pass
-                for j in xrange(c + 1, m):
-                    mati[j] = (piv*mati[j] - elim*matr[j])
-                mati[c] = zero
-
-        # 3. cancel common content of all affected rows
-        g = heuristic_row_content([mat[i][j] for i in affected_rows for j in xrange(c + 1, m) if mat[i][j] != zero], R)
-        if g != zero and g != one and (cancel_constants or not g.is_constant()):
-            for i in affected_rows:
+            mat[r], mat[pr] = mat[pr], mat[r]
+            for i in xrange(n):
                 mati = mat[i]
-                for j in xrange(c + 1, m):
-                    if mati[j] != zero:
-                        mati[j] //= g
-        del g
+                mati[c], mati[pc] = mati[pc], mati[c]
+            col_perm[c], col_perm[pc] = col_perm[pc], col_perm[c]
+        
+            affected_rows = [ i for i in xrange(r + 1, n) if mat[i][c] != zero ]
+            if ncpus > 1 and len(affected_rows) >= 2*ncpus:
+                # steps 2 to 4 in the workers
+                process_rows(affected_rows, r, c)
+            else:
+                # 2. perform elimination
+                for i in affected_rows:
+                    _gauss_eliminate_row(mat[r], mat[i], c, m, zero, one)
+
+                # 3. cancel common content of all affected rows
+                g = _gauss_common_content([ mat[i] for i in affected_rows ], c, m, R, zero, one, cancel_constants)
 
-        # 4. cancel remaining content of individual rows
-        for i in affected_rows:
-            mati = mat[i]
-            g = heuristic_row_content([mati[j] for j in xrange(m) if mati[j] != zero], R)
-            if g != zero and g != one and (cancel_constants or not g.is_constant()):
-                for j in xrange(c + 1, m):
-                    mati[j] //= g
-            del g
+                # 4. cancel remaining content of individual rows
+                for i in affected_rows:
+                    _gauss_cancel_row_content(mat[i], g, c, m, R, zero, one, cancel_constants)
+                del g
 
-        r = r + 1
+            r = r + 1
+    finally:
+        if pool is not None:
+            pool.close()
 
     dim = m - r # dimension of the solution space
 
@@ -647,6 +870,245 @@ def _gauss(pivot, ncpus, fun, mat, degrees, infolevel):
 
     return _normalize([vector(R, v) for v in sol])
 
+def _gauss_eliminate_row(matr, mati, c, m, zero, one):
+    # step 2 of _gauss for a single row: eliminate mati[c] using the pivot row matr
+
+    piv = matr[c]; elim = mati[c]
+    try: 
+        g = gcd(piv, elim)
+        if g != one:
+            piv //= g; elim //= g
+        del g
+    except:
+        pass
+    for j in xrange(c + 1, m):
+        mati[j] = (piv*mati[j] - elim*matr[j])
+    mati[c] = zero
+
+def _gauss_common_content(rows, c, m, R, zero, one, cancel_constants):
+    # step 3 of _gauss: the common content of the given rows, or one if it is not worth cancelling
+
+    g = heuristic_row_content([row[j] for row in rows for j in xrange(c + 1, m) if row[j] != zero], R)
+    if not (g != zero and g != one and (cancel_constants or not g.is_constant())):
+        g = one
+    return g
+
+def _gauss_cancel_row_content(mati, g, c, m, R, zero, one, cancel_constants):
+    # steps 3 and 4 of _gauss for a single row: divide by the common content g of all
+    # affected rows, then cancel the remaining content of the row itself
+
+    if g != one:
+        for j in xrange(c + 1, m):
+            if mati[j] != zero:
+                mati[j] //= g
+    g = heuristic_row_content([mati[j] for j in xrange(m) if mati[j] != zero], R)
+    if g != zero and g != one and (cancel_constants or not g.is_constant()):
+        for j in xrange(c + 1, m):
+            mati[j] //= g
+
+def _gauss_sparse(ncpus, fun, mat, degrees, infolevel):
+    """
+    Internal version of nullspace.gauss_ for sparse=True
+    """
+
+    n, m = mat.dimensions(); R = mat.parent().base_ring(); zero = R.zero(); one = R.one()
+    _launch_info(infolevel, "gauss", dim=(n, m), domain=R)
+
+    if n == 0:
+        return [vector(R, v) for v in VectorSpace(QQ, m).basis()]
+
+    rows = [ dict() for i in xrange(n) ]
+    for (i, j), el in mat.dict().iteritems():
+        el = R(el)
+        if el != zero:
+            rows[i][j] = el
+    rows = filter(None, rows) # discard zero rows.
+    n = len(rows)
+
+    col_rows = [ set() for j in xrange(m) ] # col_rows[j] == indices of the active rows with nonzero entry in column j
+    for i in xrange(n):
+        for j in rows[i]:
+            col_rows[j].add(i)
+    active = set(xrange(n)) # rows not yet used as pivot rows
+    # Markowitz buckets: rows and columns grouped by their number of nonzero entries. Only the rows
+    # and columns touched by an elimination step are moved between buckets.
+    row_bucket = dict(); row_count = dict(); col_bucket = dict(); col_count = dict()
+    for i in xrange(n):
+        _sparse_rebucket(row_bucket, row_count, i, len(rows[i]))
+    for j in xrange(m):
+        _sparse_rebucket(col_bucket, col_count, j, len(col_rows[j]))
+    pivots = [] # pairs (i, j) of pivot rows and columns, in the order of elimination
+    cancel_constants = (R.characteristic() == 0)
+
+    pool = None
+    if ncpus > 1:
+        # as in _gauss, one pool of workers serves the whole elimination and performs steps 2 to 4
+        # on a chunk of rows in a single call, so that the pivot row is sent only once per chunk
+        def update_rows(data, arg):
+            chunk, rowp, idx_rows, pc = arg
+            idx_rows = [ _sparse_eliminate_row(rowp, row, pc, zero, one) for row in idx_rows ]
+            g = _sparse_common_content(idx_rows, R, zero, one, cancel_constants)
+            for row in idx_rows:
+                _sparse_cancel_row_content(row, g, R, zero, one, cancel_constants)
+            return idx_rows
+
+        def process_rows(idx, pr, pc):
+            chunks = [ idx[k::ncpus] for k in xrange(ncpus) ]
+            args = [ (chunk, rows[pr], [ rows[i] for i in chunk ], pc) for chunk in chunks if chunk ]
+            for (arg, result) in pool.map(args):
+                chunk = arg[0]
+                if result is None or len(result) != len(chunk):
+                    raise ValueError("worker failed on rows " + str(chunk))
+                for i, row in zip(chunk, result):
+                    rows[i] = row
+
+        pool = WorkerPool(update_rows, None, ncpus)
+
+    _info(infolevel, "forward elimination...", alter = -1)
+
+    # forward elimination
+    try:
+        while active:
+
+            _info(infolevel, "step", len(pivots), "out of at most", min(n, m), "...", alter = -2)
+
+            if fun is not None:
+                fun(rows, len(pivots))
+
+            # 1. choose a "good" pivot
+            p = _sparse_pivot(rows, col_rows, row_bucket, col_bucket, zero)
+            if p is None:
+                break
+            (pr, pc) = p
+            pivots.append(p)
+
+            active.discard(pr)
+            _sparse_rebucket(row_bucket, row_count, pr, 0)
+            touched_cols = set(rows[pr])
+            for j in rows[pr]:
+                col_rows[j].discard(pr)
+
+            # 2. perform elimination
+            affected_rows = sorted(col_rows[pc])
+            for i in affected_rows:
+                for j in rows[i]:
+                    col_rows[j].discard(i)
+                touched_cols.update(rows[i])
+            if ncpus > 1 and len(affected_rows) >= 2*ncpus:
+                # steps 2 to 4 in the workers
+                process_rows(affected_rows, pr, pc)
+            else:
+                for i in affected_rows:
+                    rows[i] = _sparse_eliminate_row(rows[pr], rows[i], pc, zero, one)
+
+                # 3. cancel common content of all affected rows
+                g = _sparse_common_content([ rows[i] for i in affected_rows ], R, zero, one, cancel_constants)
+
+                # 4. cancel remaining content of individual rows
+                for i in affected_rows:
+                    _sparse_cancel_row_content(rows[i], g, R, zero, one, cancel_constants)
+                del g
+
+            for i in affected_rows:
+                if rows[i]:
+                    for j in rows[i]:
+                        col_rows[j].add(i)
+                    touched_cols.update(rows[i])
+                else:
+                    active.discard(i)
+                _sparse_rebucket(row_bucket, row_count, i, len(rows[i]))
+            for j in touched_cols:
+                _sparse_rebucket(col_bucket, col_count, j, len(col_rows[j]))
+    finally:
+        if pool is not None:
+            pool.close()
+
+    pivot_cols = set(j for (i, j) in pivots)
+    free_cols = [ j for j in xrange(m) if j not in pivot_cols ] 
+    dim = len(free_cols) # dimension of the solution space
+
+    if dim == 0:
+        _info(infolevel, "No solution.", alter = -1)
+        return [] # no solution
+
+    _info(infolevel, "Constructing", dim, "nullspace basis vectors.", alter = -1)
+
+    sol = [ {j: one} for j in free_cols ]
+
+    for k in xrange(len(pivots) - 1, -1, -1):
+        _info(infolevel, "Coordinate", k, alter = -2)
+        pr, pc = pivots[k]; rowp = rows[pr]
+        for solj in sol:
+            num = -sum(el*solj[l] for l, el in rowp.iteritems() if l != pc and l in solj)
+            if num == zero:
+                continue
+            den = rowp[pc]
+            # now solj[pc] = num/den, but we do it without rational functions
+            try:
+                g = gcd(num, den)
+                if g != one:
+                    num //= g; den //= g
+                del g
+            except:
+                pass
+            if den == -one:
+                den = one; num = -num
+            if den != one:
+                for l in solj:
+                    solj[l] *= den
+            solj[pc] = num
+
+    sol = [[ v.get(j, zero) for j in xrange(m) ] for v in sol ]
+
+    for v in sol:
+        g = heuristic_row_content([p for p in v if p != zero], R)
+        if g != one and g != zero:
+            for j in xrange(m):
+                v[j] //= g
+
+    return _normalize([vector(R, v) for v in sol])
+
+def _sparse_eliminate_row(rowp, rowi, pc, zero, one):
+    # step 2 of _gauss_sparse for a single row: returns rowi with its entry in column pc
+    # eliminated using the pivot row rowp
+
+    piv = rowp[pc]; elim = rowi[pc]
+    try:
+        g = gcd(piv, elim)
+        if g != one:
+            piv //= g; elim //= g
+        del g
+    except:
+        pass
+    new = dict( (j, piv*el) for j, el in rowi.iteritems() if j != pc )
+    for j, el in rowp.iteritems():
+        if j != pc:
+            el = new.get(j, zero) - elim*el
+            if el == zero:
+                new.pop(j, None)
+            else:
+                new[j] = el
+    return new
+
+def _sparse_common_content(rows, R, zero, one, cancel_constants):
+    # step 3 of _gauss_sparse: the common content of the given rows, or one if it is not worth cancelling
+
+    g = heuristic_row_content([el for row in rows for el in row.itervalues()], R)
+    if not (g != zero and g != one and (cancel_constants or not g.is_constant())):
+        g = one
+    return g
+
+def _sparse_cancel_row_content(row, g, R, zero, one, cancel_constants):
+    # steps 3 and 4 of _gauss_sparse for a single row
+
+    if g != one:
+        for j in row:
+            row[j] //= g
+    g = heuristic_row_content(row.values(), R)
+    if g != zero and g != one and (cancel_constants or not g.is_constant()):
+        for j in row:
+            row[j] //= g
+
 def hermite(early_termination=True):
     """
     Creates a solver which computes a nullspace basis of minimal degree.
@@ -926,15 +1388,23 @@ def _kronecker(subsolver, presolver, mat, degrees, infolevel):
     # all variables are translated by some offset in order to make it unlikely that
     # we get solutions like (x^2,y) which after kronecker substitution become (x^2,x^1000)
     # but are returned by the subsolver as (1,x^998).
-    Rimg = K[x0]; z = K.zero(); shift = dict( (x[j], R(x[j] - (159 + 117*j))) for j in range(len(x)) )
-    def phi(poly): ##### MOST TIME IS SPENT IN THIS FUNCTION (in particular by .subs and .dict)
-        terms = {}; poly = poly.subs(shift).dict(); 
-        for exp in poly.keys():
-            n = exp[0]; d = 1;
-            for i in xrange(len(degrees) - 1):
-                d *= degrees[i]; n += d*exp[i+1]
-            terms[n] = poly[exp] + (terms[n] if terms.has_key(n) else z)
-        return Rimg(terms)
+    # The shifts are done by Taylor shifts on coefficient arrays, and the substitution by integer arithmetic
+    # on exponent tuples. Over ZZ and prime fields, the coefficients are handled as python integers.
+    Rimg = K[x0]; offsets = [ 159 + 117*j for j in xrange(len(x)) ]
+    if K == ZZ or K.is_prime_field():
+        conv = int; modulus = None if K == ZZ else K.characteristic()
+    else:
+        conv = lambda c: c; modulus = None
+    strides = [1]
+    for d in degrees[:len(x) - 1]:
+        strides.append(strides[-1]*d)
+    def phi(poly):
+        terms = _taylor_shift(dict( (tuple(e), conv(c)) for e, c in poly.dict().iteritems() ), [ -a for a in offsets ], modulus)
+        packed = {}
+        for exp, c in terms.iteritems():
+            n = sum(e*st for e, st in zip(exp, strides))
+            packed[n] = packed[n] + c if n in packed else c
+        return Rimg(packed)
     
     # 3. subsolver in k[x]
     from sage.misc.all import prod
@@ -942,19 +1412,15 @@ def _kronecker(subsolver, presolver, mat, degrees, infolevel):
 
     # 4. undo kronecker substitution x^u |--> prod(x[i]^(u quo degprod[i-1] rem deg[i]), i=0..len(x))
     _info(infolevel, "undo substitution.", alter = -1)
-    unshift = dict( (x[j], R(x[j] + (159 + 117*j))) for j in range(len(x)) )
     def unphi(p):
-        exp = [0 for i in xrange(len(x))]; d = {}
-        for c in p.coefficients(sparse=False):
-            if c != z:
-                d[tuple(exp)] = c
-            exp[0] += 1
-            for i in xrange(len(degrees) - 1):
-                if exp[i] >= degrees[i]:
-                    exp[i] = 0; exp[i+1] += 1
-                else:
-                    break
-        return R(d).subs(unshift)
+        terms = {}
+        for n, c in p.dict().iteritems():
+            exp = []
+            for d in degrees[:len(x) - 1]:
+                n, e = divmod(n, d); exp.append(e)
+            exp.append(n)
+            terms[tuple(exp)] = conv(c)
+        return R(_taylor_shift(terms, offsets, modulus))
     sol = [ v.apply_map(unphi, R) for v in sol ]
 
     if R.base_ring().is_field():
@@ -970,6 +1436,41 @@ def _kronecker(subsolver, presolver, mat, degrees, infolevel):
     # 5. done
     return sol
 
+def _taylor_shift(terms, shifts, modulus=None):
+    # Given a multivariate polynomial p as dictionary mapping exponent tuples to coefficients, returns the
+    # dictionary of p(x[0] + shifts[0], x[1] + shifts[1], ...). The shifts are performed one variable at a time
+    # on the coefficient arrays of p with respect to this variable. Coefficients are reduced mod modulus,
+    # unless it is None.
+
+    for i in xrange(len(shifts)):
+        a = shifts[i]
+        if a == 0:
+            continue
+        groups = {} # maps the exponent tuple without its i-th entry to the coefficient array wrt x[i]
+        for exp, c in terms.iteritems():
+            key = exp[:i] + exp[i+1:]; e = exp[i]
+            arr = groups.get(key)
+            if arr is None:
+                arr = groups[key] = []
+            if len(arr) <= e:
+                arr.extend(0 for k in xrange(e + 1 - len(arr)))
+            arr[e] = c
+        terms = {}
+        for key, arr in groups.iteritems():
+            d = len(arr) - 1
+            for k in xrange(d):
+                for j in xrange(d - 1, k - 1, -1):
+                    arr[j] += a*arr[j + 1]
+                if modulus is not None:
+                    for j in xrange(k, d):
+                        arr[j] %= modulus
+            for e in xrange(d + 1):
+                if arr[e] != 0:
+                    terms[key[:i] + (e,) + key[i:]] = arr[e]
+
+    if modulus is not None:
+        terms = dict( (exp, c % modulus) for exp, c in terms.iteritems() if c % modulus != 0 )
+    return terms
 
 def lagrange(subsolver, start_point=10, ncpus=1):
     r"""
@@ -996,6 +1497,14 @@ def lagrange(subsolver, start_point=10, ncpus=1):
        sage: A*V[0]
        (0, 0, 0, 0)
 
+    Evaluation points at which the rank drops are detected::
+
+       sage: x = GF(1093)['x'].gen()
+       sage: lagrange(sage_native, start_point=0)(matrix([[1, 0], [0, x]]))
+       []
+       sage: lagrange(sage_native, start_point=0)(matrix([[1, x, 0], [0, x, x]]))
+       [(x, 1092, 1)]
+
     ALGORITHM:
 
     #. For ``x`` replaced by ``start_point``, ``start_point+1``, ``start_point+2``, ..., compute the
@@ -1008,6 +1517,9 @@ def lagrange(subsolver, start_point=10, ncpus=1):
        - The solver raises a ``ValueError`` if the ground field is too small.
        - It is assumed that the ``subsolver`` returns a normal form of the nullspace basis, so that results of
          calls for different evaluations have some common preimage in the matrices over `K(x)`
+       - If `K` is a prime field with `2 < p < 2^{31}` and the ``subsolver`` is `sage_native`_, the
+         evaluation, the solving, and the interpolation are each carried out for all evaluation points at
+         once on ``numpy`` arrays of machine integers. The same holds for `numpy_native`_ as ``subsolver``.
 
     """
     def lagrange_solver(mat, degrees=[], infolevel=0):
@@ -1036,96 +1548,137 @@ def _lagrange(subsolver, start_point, ncpus, mat, degrees, infolevel):
     if char > 0 and char < start_point + bound:
         raise ValueError, "not enough evaluation points"
 
-    points = map(lambda p: R(start_point + p), range(bound))
-    M = product_tree(x, points, 0, bound); mod = M[0]; Mprime = []
-    multipoint_evaluate(mod.derivative(), points, 0, bound, M, Mprime)
+    # evaluation, solving and interpolation can be done on machine integers for all points at once
+    batch = subsolver in (sage_native, numpy_native) and K.is_prime_field() and 2 < char < 2**31
 
-    if rational:
-        mymat = mat.apply_map(lambda p: (p.numerator() * p.denominator().inverse_mod(mod)) % mod, R)
+    if ncpus > 1:
+        def solve_at(mat, point):
+            return subsolver(mat.apply_map(lambda q: q(point), K), infolevel=_alter_infolevel(infolevel, -2, 1))
+        pool = WorkerPool(solve_at, mat, ncpus) # the matrix is shipped to the workers only once
     else:
-        mymat = mat
+        pool = None
+
+    def solve(mat, points, Mprime, M):
+        # evaluation, solving, and interpolation
+        if pool is not None:
+            return _lagrange_par(pool, points, Mprime, M)
+        mod = M[0]
+        if rational:
+            try:
+                mymat = mat.apply_map(lambda q: (q.numerator() * q.denominator().inverse_mod(mod)) % mod, R)
+            except (ValueError, ZeroDivisionError): # a denominator vanishes at some point
+                raise UnluckyPoint("unlucky evaluation point")
+        else:
+            mymat = mat
+        if batch:
+            return _lagrange_batch(mymat, points, Mprime, M)
+        return _lagrange_rec(mod, mymat, Mprime, 0, len(points), M, subsolver, _alter_infolevel(infolevel, -2, 1))
 
     try:
-        V = _lagrange_rec(mod, mymat, Mprime, 0, bound, M, subsolver, _alter_infolevel(infolevel, -1, 1))
-    except NoSolution:
-        return []
-    
-    if degree_known:
-        
-        # rational reconstruction and normalization
-        split = bound//2; 
-        for v in V:
-            d = one
-            for p in v:
-                d = d.lcm(p.rational_reconstruct(mod, split, split)[1])
-            for j in xrange(len(v)):
-                v[j] = (v[j]*d) % mod
-            j = 0
-            while v[j] == zero:
-                j += 1
-            piv = one/_leading_coefficient(v[j])
-            for k in xrange(j, m):
-                v[k] *= piv
-                
-        return [ vector(R, v) for v in V ]
+        points = map(lambda p: R(start_point + p), range(bound))
+        M = product_tree(x, points, 0, bound); mod = M[0]; Mprime = []
+        multipoint_evaluate(mod.derivative(), points, 0, bound, M, Mprime)
 
-    # double the number of evaluation points until a solution is reached.
+        attempts = 0
+        while True:
+            try:
+                V = solve(mat, points, Mprime, M)
+                break
+            except NoSolution:
+                return []
+            except UnluckyPoint:
+                # the rank drops at some point; retry with fresh points
+                attempts += 1
+                if attempts > 3:
+                    raise
+                _info(infolevel, "Unlucky evaluation point encountered.", alter = -1)
+                start_point += bound
+                if char > 0 and char < start_point + bound:
+                    raise ValueError, "not enough evaluation points"
+                points = map(lambda p: R(start_point + p), range(bound))
+                M = product_tree(x, points, 0, bound); mod = M[0]; Mprime = []
+                multipoint_evaluate(mod.derivative(), points, 0, bound, M, Mprime)
         
-    modulus = mod; done = False
+        if degree_known:
+            
+            # rational reconstruction and normalization
+            split = bound//2; 
+            for v in V:
+                d = one
+                for p in v:
+                    d = d.lcm(p.rational_reconstruct(mod, split, split)[1])
+                for j in xrange(len(v)):
+                    v[j] = (v[j]*d) % mod
+                j = 0
+                while v[j] == zero:
+                    j += 1
+                piv = one/_leading_coefficient(v[j])
+                for k in xrange(j, m):
+                    v[k] *= piv
+                    
+            return [ vector(R, v) for v in V ]
+
+        # double the number of evaluation points until a solution is reached.
+            
+        modulus = mod; done = False; attempts = 0
 
-    while not done:
+        while not done:
 
-        start_point += bound; bound *= 2
-        _info(infolevel, "Taking", bound, "more interpolation points...", alter = -1)
-        if start_point + bound > char:
-            raise ValueError, "not enough evaluation points"
-        points = map(lambda p: R(start_point + p), range(bound))
-        M = product_tree(x, points, 0, bound); mod = M[0]; Mprime = []
-        multipoint_evaluate(mod.derivative(), points, 0, bound, M, Mprime)
+            start_point += bound; bound *= 2
+            _info(infolevel, "Taking", bound, "more interpolation points...", alter = -1)
+            if start_point + bound > char:
+                raise ValueError, "not enough evaluation points"
+            points = map(lambda p: R(start_point + p), range(bound))
+            M = product_tree(x, points, 0, bound); mod = M[0]; Mprime = []
+            multipoint_evaluate(mod.derivative(), points, 0, bound, M, Mprime)
 
-        if rational:
             try:
-                mymat = mat.apply_map(lambda q: (q.numerator() * q.denominator().inverse_mod(mod)) % mod, R)
-            except ValueError:
+                Vnew = solve(mat, points, Mprime, M)
+            except UnluckyPoint:
+                # as above, give up if the failure persists for fresh points
+                attempts += 1
+                if attempts > 3:
+                    raise
                 _info(infolevel, "Unlucky evaluation point encountered.", alter = -1)
                 if bound > 128:
                     bound /= 4; start_point -= bound
                 continue
-        else:
-            mymat = mat
+            attempts = 0
 
-        Vnew = _lagrange_rec(mod, mymat, Mprime, 0, bound, M, subsolver, _alter_infolevel(infolevel, -2, 1))
+            _info(infolevel, "Combining with previous partial solution...", alter = -1)
+            inv = xgcd(modulus, mod)[1]*modulus
+            for i in xrange(len(V)):
+                for j in xrange(len(V[i])):
+                    V[i][j] = V[i][j] + (Vnew[i][j] - V[i][j])*inv
+            modulus *= mod
 
-        _info(infolevel, "Combining with previous partial solution...", alter = -1)
-        inv = xgcd(modulus, mod)[1]*modulus
-        for i in xrange(len(V)):
-            for j in xrange(len(V[i])):
-                V[i][j] = V[i][j] + (Vnew[i][j] - V[i][j])*inv
-        modulus *= mod
+            # at this point V is correct mod 'modulus'
 
-        # at this point V is correct mod 'modulus'
+            # check for termination
+            _info(infolevel, "Checking for termination...", alter = -1)
+            split = modulus.degree()//2; W = []; done = True
+            for v in V:
+                try:
+                    d = one
+                    for p in v:
+                        d = d.lcm(p.rational_reconstruct(modulus, split, split)[1])
+                except ValueError:
+                    done = False; break
+                w = [ (p*d) % modulus for p in v ]; W.append(w)
+                if any(mat*vector(R, w)):
+                    done = False; break
+                j = 0
+                while w[j] == zero:
+                    j += 1
+                piv = one/_leading_coefficient(w[j])
+                for k in xrange(j, m):
+                    w[k] *= piv
+        
+        return [ vector(R, v) for v in W ]
 
-        # check for termination
-        _info(infolevel, "Checking for termination...", alter = -1)
-        split = modulus.degree()//2; W = []; done = True
-        for v in V:
-            try:
-                d = one
-                for p in v:
-                    d = d.lcm(p.rational_reconstruct(modulus, split, split)[1])
-            except ValueError:
-                done = False; break
-            w = [ (p*d) % modulus for p in v ]; W.append(w)
-            if any(mat*vector(R, w)):
-                done = False; break
-            j = 0
-            while w[j] == zero:
-                j += 1
-            piv = one/_leading_coefficient(w[j])
-            for k in xrange(j, m):
-                w[k] *= piv
-    
-    return [ vector(R, v) for v in W ]
+    finally:
+        if pool is not None:
+            pool.close()
             
 
 def product_tree(x, points, a, b):
@@ -1182,10 +1735,94 @@ def _lagrange_rec(mod, mat, Mprime, a, b, product_tree, subsolver, infolevel):
     mymat = [ [ p % M_right for p in v ] for v in mat ]
     V_right = _lagrange_rec(mod, mymat, Mprime, split, b, product_tree[2], subsolver, infolevel)
     del mymat
+
+    if len(V_left) != len(V_right):
+        raise UnluckyPoint("unlucky evaluation point")
     
     return [ map(lambda v_l, v_r: M_right*v_l + M_left*v_r, V_left[i], V_right[i]) for i in xrange(len(V_left)) ]
 
-def galois(subsolver, max_modulus=MAX_MODULUS, proof=False):
+def _lagrange_par(pool, points, Mprime, product_tree):
+    # parallel variant of _lagrange_rec: the workers of the pool evaluate the original matrix at the
+    # points and solve the resulting matrices, and the results are combined by interpolation
+
+    R = product_tree[0].parent()
+    images = dict( pool.map([ p[0] for p in points ]) )
+
+    def combine(a, b, tree):
+        if b - a == 1:
+            V = images[points[a][0]]
+            if len(V) == 0:
+                raise NoSolution
+            return [[ R(p/Mprime[a]) for p in v ] for v in V]
+        split = int(math.ceil((a + b)/2))
+        V_left = combine(a, split, tree[1]); V_right = combine(split, b, tree[2])
+        if len(V_left) != len(V_right):
+            raise UnluckyPoint("unlucky evaluation point")
+        M_left = tree[1][0]; M_right = tree[2][0]
+        return [ map(lambda v_l, v_r: M_right*v_l + M_left*v_r, V_left[i], V_right[i]) for i in xrange(len(V_left)) ]
+
+    return combine(0, len(points), product_tree)
+
+def _lagrange_batch(mat, points, Mprime, product_tree):
+    # variant of _lagrange_rec for matrices over GF(p)[x] with p < 2^31 and sage_native as subsolver:
+    # the matrix is evaluated at all points at once, the evaluated matrices are brought into echelon
+    # form simultaneously, and the solutions are interpolated along the given product tree.
+    # All arithmetic is done on numpy int64 arrays; since p < 2^31, one product of residues plus one
+    # residue fits into 63 bits, so that reductions are needed only once per multiply-add.
+    import numpy
+
+    R = product_tree[0].parent(); p = R.characteristic(); n = len(mat); m = len(mat[0])
+    X = numpy.array([ int(pt[0]) for pt in points ], dtype=numpy.int64)
+
+    # evaluation by a vectorized Horner scheme: A[k, i, j] = mat[i][j](points[k])
+    entries = [ q.list() for row in mat for q in row ]
+    deg = max([ len(c) for c in entries ] + [1])
+    C = numpy.zeros((n*m, deg), dtype=numpy.int64)
+    for i in xrange(n*m):
+        C[i, :len(entries[i])] = [ int(c) for c in entries[i] ]
+    acc = numpy.zeros((n*m, len(X)), dtype=numpy.int64)
+    for d in xrange(deg - 1, -1, -1):
+        acc = (acc*X[None, :] + C[:, d][:, None]) % p
+    A = acc.T.reshape((len(X), n, m)).copy()
+
+    # solving: kernel bases in echelon form, as returned by sage_native
+    V = _kernel_mod_p(A, p)
+    r = m - V.shape[1]
+
+    # interpolation along the shared product tree
+    inv = _pow_mod(numpy.array([ int(q) for q in Mprime[:len(X)] ], dtype=numpy.int64), p - 2, p)
+    values = (V.reshape((len(X), (m - r)*m)).T * inv[None, :]) % p
+
+    def coeffs(poly):
+        return numpy.array([ int(c) for c in poly.list() ], dtype=numpy.int64)
+
+    def combine(a, b, tree):
+        if b - a == 1:
+            return values[:, a:b]
+        split = int(math.ceil((a + b)/2))
+        left = _polmul_rows(combine(a, split, tree[1]), coeffs(tree[2][0]), p)
+        right = _polmul_rows(combine(split, b, tree[2]), coeffs(tree[1][0]), p)
+        out = numpy.zeros((values.shape[0], max(left.shape[1], right.shape[1])), dtype=numpy.int64)
+        out[:, :left.shape[1]] += left; out[:, :right.shape[1]] += right
+        return out % p
+
+    W = combine(0, len(X), product_tree)
+    return [ [ R(map(int, W[k*m + j])) for j in xrange(m) ] for k in xrange(m - r) ]
+
+def _polmul_rows(A, f, p):
+    # product of each row of A (coefficient arrays, lowest degree first) with the polynomial f, modulo p < 2^31
+    import numpy
+
+    out = numpy.zeros((A.shape[0], A.shape[1] + len(f) - 1), dtype=numpy.int64)
+    if len(f) <= A.shape[1]:
+        for i in xrange(len(f)):
+            out[:, i:i + A.shape[1]] = (out[:, i:i + A.shape[1]] + A*f[i]) % p
+    else:
+        for j in xrange(A.shape[1]):
+            out[:, j:j + len(f)] = (out[:, j:j + len(f)] + A[:, j][:, None]*f[None, :]) % p
+    return out
+
+def galois(subsolver, max_modulus=MAX_MODULUS, proof=False, early_termination=False):
     r"""
     Creates a subsolver based on chinese remaindering for matrices over `K[x]` or `K[x,y,..]` where
     `K` is a single algebraic extension of `QQ`
@@ -1199,6 +1836,8 @@ def galois(subsolver, max_modulus=MAX_MODULUS, proof=False):
       arithmetic.
     - ``proof`` -- a boolean value. If set to ``False`` (default), a termination is only tested in a
       homomorphic image, which saves much time but may, with a very low probability, lead to a wrong output.
+    - ``early_termination`` -- a boolean value, passed on to nullspace.cra_ when the coefficient domain
+      is `QQ` or `ZZ`. Defaults to ``False``.
 
     OUTPUT:
 
@@ -1212,6 +1851,9 @@ def galois(subsolver, max_modulus=MAX_MODULUS, proof=False):
        sage: K.<a> = NumberField(x^3-2, 'a')
        sage: A = MatrixSpace(K['x'], 4, 5).random_element(degree=3)
        sage: my_solver = galois(gauss())
+       sage: V = my_solver(A)
+       sage: A*V[0]
+       (0, 0, 0, 0)
 
     ALGORITHM:
 
@@ -1231,13 +1873,138 @@ def galois(subsolver, max_modulus=MAX_MODULUS, proof=False):
     """
     def galois_solver(mat, degrees=[], infolevel=0):
         """See docstring of galois() for further information."""
-        return _galois(subsolver, max_modulus, proof, mat, degrees, infolevel)
+        return _galois(subsolver, max_modulus, proof, early_termination, mat, degrees, infolevel)
     return galois_solver
 
-def _galois(subsolver, max_modulus, proof, mat, degrees, infolevel):
-    raise NotImplementedError
+def _galois(subsolver, max_modulus, proof, early_termination, mat, degrees, infolevel):
+    """
+    Internal version of nullspace.galois_
+    """
+    R = mat.parent().base_ring(); x = R.gens(); K = R.base_ring()
+    _launch_info(infolevel, "galois", dim=mat.dimensions(), domain=R)    
+
+    if K.is_prime_field():
+        return subsolver(mat, degrees=degrees)
+
+    if K == QQ or K == ZZ:
+        return _cra(subsolver, max_modulus, proof, 1, early_termination, mat, degrees, infolevel)
+
+    try:
+        minpoly = K.polynomial(); a = K.gen()
+    except AttributeError:
+        raise TypeError
+    if minpoly.base_ring() != QQ:
+        raise TypeError # relative extensions are not supported
+    d = minpoly.degree()
+
+    # coordinates of the matrix entries with respect to the power basis 1, a, ..., a^(d-1)
+    RQ = R.change_ring(QQ)
+    coords = [ [ [ RQ(pol.map_coefficients(lambda c: c.list()[l], QQ)) for l in xrange(d) ]
+                 for pol in row ] for row in mat.rows() ]
+
+    def image(Zp, root):
+        # the matrix over Zp obtained by mapping a to root
+        powers = [ root**l for l in xrange(d) ]
+        return matrix(Zp, [ [ sum(Zp(c[l])*powers[l] for l in xrange(d)) for c in row ] for row in coords ])
+
+    # precomputed material used in the homomorphic termination check
+    check_prime = pp(max_modulus)
+    while True:
+        try:
+            check_root = minpoly.change_ring(GF(check_prime)).roots(multiplicities=False)
+        except ArithmeticError:
+            check_root = []
+        if len(check_root) > 0:
+            break
+        check_prime = pp(check_prime)
+    check_field = GF(check_prime); check_root = check_root[0]
+    check_eval = dict(zip(x, [ 17*j + 13 for j in xrange(len(x)) ]))
+    check_powers = [ check_root**l for l in xrange(d) ]
+    check_mat = matrix(check_field, [ [ sum(check_field(c[l].substitute(check_eval))*check_powers[l] for l in xrange(d))
+                                        for c in row ] for row in coords ])
 
-def cra(subsolver, max_modulus=MAX_MODULUS, proof=False, ncpus=1):
+    R = R.change_ring(ZZ)
+    V = None; M = 1; p = check_prime
+
+    while True:
+
+        _info(infolevel, math.floor(math.log(M, 10)/2), " decimal digits completed.", alter = -1)
+
+        # compute solution(s) modulo p, for each root of minpoly mod p
+        p = pp(p)
+        try:
+            roots = minpoly.change_ring(GF(p)).roots(multiplicities=False)
+        except ArithmeticError: # p divides a denominator of minpoly
+            continue
+        if len(roots) < d: # minpoly does not split into distinct linear factors mod p
+            continue
+        try:
+            Zp = R.change_ring(GF(p))
+            images = [ subsolver(image(Zp, r), degrees=degrees, infolevel=_alter_infolevel(infolevel, -2, 1)) for r in roots ] # MAIN WORK
+            if any( len(u) - len(images[0]) for u in images ):
+                raise ArithmeticError # solution spaces have different sizes
+            # interpolation: recover the coordinates of the solution with respect to the power basis
+            Vinv = matrix(GF(p), [ [ r**l for l in xrange(d) ] for r in roots ]).inverse()
+            Vp = [ [ sum(Vinv[l, k]*images[k][i][j] for k in xrange(d)) for j in xrange(len(images[0][i])) for l in xrange(d) ]
+                   for i in xrange(len(images[0])) ]
+        except ArithmeticError: # unlucky prime may cause division by zero when mapping QQ --> Z_p
+            _info(infolevel, "unlucky modulus ", p, " discarded (division by zero)", alter = -1)
+            continue
+
+        # degenerate situations
+        if len(x) == 1:
+            true_degrees = [max(max(e.degree() for e in v) for v in Vp)] if Vp else [-1]
+        else:
+            true_degrees = [max(max(e.degree(x0) for e in v) for v in Vp) for x0 in x] if Vp else [-1 for x0 in x]
+
+        if len(degrees) != len(x):
+            degrees = [-1 for i in x]
+        
+        if V == None or len(V) > len(Vp) or any(degrees[i] > true_degrees[i] for i in xrange(len(x))):
+            # initialization, or all previous primes were unlucky
+            if len(Vp) == 0:
+                return []
+            V = [ [R(e) for e in v] for v in Vp ]; M = p;
+            degrees = true_degrees
+            _info(infolevel, "expecting solution degrees ", degrees, alter = -1)
+        elif len(V) < len(Vp): # this prime is unlucky, skip it
+            _info(infolevel, "unlucky modulus ", p, " discarded (dimension defect)", alter = -1)
+            continue
+        elif any(degrees[i] < true_degrees[i] for i in xrange(len(x))): # this prime is unlucky, skip it
+            _info(infolevel, "unlucky modulus ", p, " discarded (degree missmatch: ", true_degrees, ")", alter = -1)
+            continue
+        else:
+            # combine the new solution with the known partial solution
+            (g, M0, p0) = xgcd(p, M); (M0, p0) = (R(M0*p), R(p0*M)); M *= p
+            for i in xrange(len(V)):
+                Vi = V[i]; Vpi = Vp[i]
+                for j in xrange(len(Vi)):
+                    Vi[j] = Vi[j]*M0 + R(Vpi[j])*p0
+
+        # rational reconstruction and check for termination
+        try:
+            sol = []; m = M//2
+            for v in V:
+                den = ZZ.one()
+                for e in v:
+                    for c in e.coefficients():
+                        den *= (den*c).rational_reconstruction(M).denominator()
+                w = [ e.map_coefficients( lambda c: ((den*c + m) % M) - m, ZZ ) for e in v ]
+                # w[j*d + l] is the coefficient of a^l in the j-th component of the solution vector
+                if not proof:
+                    u = vector(check_field, [ sum(check_field(w[j*d + l].substitute(check_eval))*check_powers[l] for l in xrange(d))
+                                              for j in xrange(len(w)//d) ])
+                    if any(check_mat * u):
+                        raise ArithmeticError # more primes needed
+                w = vector(mat.parent().base_ring(), [ sum(w[j*d + l].change_ring(K)*a**l for l in xrange(d)) for j in xrange(len(w)//d) ])
+                if proof and any(mat * w):
+                    raise ArithmeticError # more primes needed
+                sol.append(w)
+            return sol # if no error was raised for any of the v in V, then we are done        
+        except (ValueError, ArithmeticError):
+            pass
+
+def cra(subsolver, max_modulus=MAX_MODULUS, proof=False, ncpus=1, early_termination=False):
     r"""
     Creates a subsolver based on chinese remaindering for matrices over `K[x]` or `K[x,y,..]` where
     `K` is `ZZ` or `QQ` or `GF(p)`.
@@ -1252,6 +2019,13 @@ def cra(subsolver, max_modulus=MAX_MODULUS, proof=False, ncpus=1):
     - ``proof`` -- a boolean value. If set to ``False`` (default), a termination is only tested in a
       homomorphic image, which saves much time but may, with a very low probability, lead to a wrong output.
     - ``ncpus`` -- number of cpus that may be used in parallel by the solver (default=1).
+    - ``early_termination`` -- a boolean value. If set to ``True``, the number of primes considered
+      between two reconstruction attempts grows geometrically, and the full rational reconstruction is
+      only attempted once the reconstruction of a random linear projection of the solution vectors
+      agrees with the one obtained from the previous batch of primes. This pays off for solutions with
+      large coefficients, but needs at least three primes and may use up to about four times as many
+      primes as necessary. If set to ``False`` (default), every prime (or every ``ncpus`` primes) is
+      followed by a full reconstruction attempt.
 
     OUTPUT:
 
@@ -1282,10 +2056,10 @@ def cra(subsolver, max_modulus=MAX_MODULUS, proof=False, ncpus=1):
     """
     def cra_solver(mat, degrees=[], infolevel=0) :
         """See docstring of cra() for further information."""
-        return _cra(subsolver, max_modulus, proof, ncpus, mat, degrees, infolevel)
+        return _cra(subsolver, max_modulus, proof, ncpus, early_termination, mat, degrees, infolevel)
     return cra_solver
 
-def _cra(subsolver, max_modulus, proof, ncpus, mat, degrees, infolevel):
+def _cra(subsolver, max_modulus, proof, ncpus, early_termination, mat, degrees, infolevel):
     """
     Internal version of nullspace.cra_ 
     """
@@ -1308,91 +2082,126 @@ def _cra(subsolver, max_modulus, proof, ncpus, mat, degrees, infolevel):
     
     V = None; M = 1; p = check_prime
 
-    if ncpus > 1:
-        @parallel(ncpus=ncpus)
-        def forked_subsolver(Zp):
-            return subsolver(mat.apply_map(Zp, Zp), degrees=degrees, infolevel=_alter_infolevel(infolevel, -2, 1))
+    # material for early termination: a random projection of the solution vectors is reconstructed
+    # after each batch of primes, and full reconstruction is only attempted once it has stabilized. 
+    weights = [ ZZ.random_element(1, 2**16) for j in xrange(mat.ncols()) ]
+    old_proj = None; batch = ncpus
+
+    def solve_mod(mat, arg):
+        p, degrees = arg; Zp = GF(p)[x]
+        return subsolver(mat.apply_map(Zp, Zp), degrees=degrees, infolevel=_alter_infolevel(infolevel, -2, 1))
+    pool = WorkerPool(solve_mod, mat, ncpus) # the matrix is shipped to the workers only once
+
+    def solution_shape(Vp):
+        if len(Vp) == 0:
+            return (0, [-1 for x0 in x])
+        elif len(x) == 1:
+            return (len(Vp), [max(max(e.degree() for e in v) for v in Vp)])
+        else:
+            return (len(Vp), [max(max(e.degree(x0) for e in v) for v in Vp) for x0 in x])
         
-    while True:
+    try:
+        while True:
 
-        _info(infolevel, math.floor(math.log(M, 10)/2), " decimal digits completed.", alter = -1)
+            _info(infolevel, math.floor(math.log(M, 10)/2), " decimal digits completed.", alter = -1)
         
-        # compute solution(s) modulo p
-        try:
-            if ncpus == 1:
-                p = pp(p); Zp = GF(p)[x]
-                 # MAIN WORK, SEQUENTIALLY
-                Vp = subsolver(mat.apply_map(Zp, Zp), degrees=degrees, infolevel=_alter_infolevel(infolevel, -2, 1))
-                m = p
-            else:
-                Zp = []
-                while len(Zp) < ncpus:
-                    p = pp(p); Zp.append(GF(p)[x])
-                Vpp = [ (u[0][0].characteristic(), v) for (u, v) in forked_subsolver(Zp) ] # MAIN WORK, DONE IN PARALLEL
-                # combine them, provided all the Vp have the same length (viz. none of the primes was unlucky)
-                primes = [ u[0] for u in Vpp ];  Vpp = [ u[1] for u in Vpp ];
-                if any( len(u) - len(Vpp[0]) for u in Vpp ):
-                    raise ArithmeticError # solution spaces have different sizes
-                basis = map(R, CRT_basis(primes))
-                Vp = [ v.apply_map(lambda u: basis[0]*R(u)) for v in Vpp[0] ]
-                for i in xrange(1, len(Vpp)):
-                    for j in xrange(len(Vp)):
-                        Vp[j] += Vpp[i][j].apply_map(lambda u: basis[i]*R(u))
-                m = prod(primes)
-                # now Vp is a solution mod m, and m is the product of 'ncpus' many primes.
-        except ArithmeticError: # unlucky prime may cause division by zero when mapping QQ --> Z_p
-            _info(infolevel, "unlucky modulus ", m, " discarded (division by zero)", alter = -1)
-            continue
+            # compute solution(s) modulo 'batch' many primes
+            try:
+                if ncpus == 1 and batch == 1:
+                    p = pp(p); Zp = GF(p)[x]
+                     # MAIN WORK, SEQUENTIALLY
+                    Vp = subsolver(mat.apply_map(Zp, Zp), degrees=degrees, infolevel=_alter_infolevel(infolevel, -2, 1))
+                    m = p
+                else:
+                    primes = []
+                    while len(primes) < batch:
+                        p = pp(p); primes.append(p)
+                    Vpp = [ (u[0], v) for (u, v) in pool.map([ (q, degrees) for q in primes ]) ] # MAIN WORK, DONE IN PARALLEL
+                    if early_termination:
+                        # discard the primes whose solution space has a larger dimension or larger degrees than the others
+                        shapes = [ solution_shape(u[1]) for u in Vpp ]; best = min(shapes)
+                        Vpp = [ Vpp[i] for i in xrange(len(Vpp)) if shapes[i] == best ]
+                    # combine them, provided all the Vp have the same length (viz. none of the primes was unlucky)
+                    primes = [ u[0] for u in Vpp ];  Vpp = [ u[1] for u in Vpp ];
+                    if any( len(u) - len(Vpp[0]) for u in Vpp ):
+                        raise ArithmeticError # solution spaces have different sizes
+                    basis = map(R, CRT_basis(primes))
+                    Vp = [ v.apply_map(lambda u: basis[0]*R(u)) for v in Vpp[0] ]
+                    for i in xrange(1, len(Vpp)):
+                        for j in xrange(len(Vp)):
+                            Vp[j] += Vpp[i][j].apply_map(lambda u: basis[i]*R(u))
+                    m = prod(primes)
+                    # now Vp is a solution mod m, and m is the product of 'batch' many primes.
+            except ArithmeticError: # unlucky prime may cause division by zero when mapping QQ --> Z_p
+                _info(infolevel, "unlucky modulus ", m, " discarded (division by zero)", alter = -1)
+                continue
 
-        # degenerate situations
-        if len(x) == 1:
-            true_degrees = [max(max(e.degree() for e in v) for v in Vp)]
-        else:
-            true_degrees = [max(max(e.degree(x0) for e in v) for v in Vp) for x0 in x]
+            if early_termination:
+                batch = 2*batch # geometric growth of the batch size
 
-        if len(degrees) != len(x):
-            degrees = [-1 for i in x]
-        
-        if V == None or len(V) > len(Vp) or any(degrees[i] > true_degrees[i] for i in xrange(len(x))):
-            # initialization, or all previous primes were unlucky
-            if len(Vp) == 0:
-                return []
-            V = [ [R(e) for e in v] for v in Vp ]; M = m;
-            degrees = true_degrees
-            _info(infolevel, "expecting solution degrees ", degrees, alter = -1)
-        elif len(V) < len(Vp): # this prime is unlucky, skip it
-            _info(infolevel, "unlucky modulus ", m, " discarded (dimension defect)", alter = -1)
-            continue
-        elif any(degrees[i] < true_degrees[i] for i in xrange(len(x))): # this prime is unlucky, skip it
-            _info(infolevel, "unlucky modulus ", m, " discarded (degree missmatch: ", true_degrees, ")", alter = -1)
-            continue
+            # degenerate situations
+            if len(x) == 1:
+                true_degrees = [max(max(e.degree() for e in v) for v in Vp)]
+            else:
+                true_degrees = [max(max(e.degree(x0) for e in v) for v in Vp) for x0 in x]
+
+            if len(degrees) != len(x):
+                degrees = [-1 for i in x]
         
-        # combine the new solution with the known partial solution
-        if M != m: # (i.e., always except in the first iteration)
-            (g, M0, p0) = xgcd(m, M); (M0, p0) = (R(M0*m), R(p0*M)); M *= m
-            for i in xrange(len(V)):
-                Vi = V[i]; Vpi = Vp[i]
-                for j in xrange(len(V[i])):
-                    Vi[j] = Vi[j]*M0 + R(Vpi[j])*p0
+            if V == None or len(V) > len(Vp) or any(degrees[i] > true_degrees[i] for i in xrange(len(x))):
+                # initialization, or all previous primes were unlucky
+                if len(Vp) == 0:
+                    return []
+                V = [ [R(e) for e in v] for v in Vp ]; M = m; old_proj = None
+                degrees = true_degrees
+                _info(infolevel, "expecting solution degrees ", degrees, alter = -1)
+            elif len(V) < len(Vp): # this prime is unlucky, skip it
+                _info(infolevel, "unlucky modulus ", m, " discarded (dimension defect)", alter = -1)
+                continue
+            elif any(degrees[i] < true_degrees[i] for i in xrange(len(x))): # this prime is unlucky, skip it
+                _info(infolevel, "unlucky modulus ", m, " discarded (degree missmatch: ", true_degrees, ")", alter = -1)
+                continue
         
-        # rational reconstruction and check for termination
-        try:
-            sol = []; m = M//2
-            for v in V:
-                d = ZZ.one()
-                for e in v:
-                    for c in e.coefficients():
-                        d *= (d*c).rational_reconstruction(M).denominator()
-                w = vector(R, [e.map_coefficients( lambda c: ((d*c + m) % M) - m, ZZ ) for e in v ])
-                if (not proof and any(check_mat * vector(check_field, [e.substitute(check_eval) for e in w]))) or \
-                       (proof and any(mat * w) ):
-                    raise ArithmeticError # more primes needed
-                sol.append(w)
-            return sol # if no error was raised for any of the v in V, then we are done        
-        except (ValueError, ArithmeticError):
-            pass
+            # combine the new solution with the known partial solution
+            if M != m: # (i.e., always except in the first iteration)
+                (g, M0, p0) = xgcd(m, M); (M0, p0) = (R(M0*m), R(p0*M)); M *= m
+                for i in xrange(len(V)):
+                    Vi = V[i]; Vpi = Vp[i]
+                    for j in xrange(len(V[i])):
+                        Vi[j] = Vi[j]*M0 + R(Vpi[j])*p0
+
+            # rational reconstruction of the projection, full reconstruction only if it has stabilized
+            if early_termination:
+                try:
+                    proj = [ sum(weights[j]*v[j] for j in xrange(len(v))).map_coefficients(lambda c: c % M, ZZ) for v in V ]
+                    proj = [ dict((k, c.rational_reconstruction(M)) for k, c in e.dict().iteritems()) for e in proj ]
+                except (ValueError, ArithmeticError):
+                    proj = None
+                stable = proj is not None and proj == old_proj
+                old_proj = proj
+                if not stable:
+                    continue
+
+            # rational reconstruction and check for termination
+            try:
+                sol = []; m = M//2
+                for v in V:
+                    d = ZZ.one()
+                    for e in v:
+                        for c in e.coefficients():
+                            d *= (d*c).rational_reconstruction(M).denominator()
+                    w = vector(R, [e.map_coefficients( lambda c: ((d*c + m) % M) - m, ZZ ) for e in v ])
+                    if (not proof and any(check_mat * vector(check_field, [e.substitute(check_eval) for e in w]))) or \
+                           (proof and any(mat * w) ):
+                        raise ArithmeticError # more primes needed
+                    sol.append(w)
+                return sol # if no error was raised for any of the v in V, then we are done        
+            except (ValueError, ArithmeticError):
+                pass
+    finally:
+        pool.close()
 
-def newton(subsolver, inverse=lambda mat:mat.inverse()):
+def newton(subsolver, inverse=lambda mat:mat.inverse(), order_basis=False):
     r"""
     Constructs a solver based on x-adic lifting for matrices with entries over `K[x]` where `K` is a field.
 
@@ -1401,6 +2210,10 @@ def newton(subsolver, inverse=lambda mat:mat.inverse()):
     - ``subsolver`` -- a solver for matrices over `K`
     - ``inverse`` -- a function for computing the inverse of a given regular square matrix with entries in `K`.
       Defaults to ``lambda mat : mat.inverse()``
+    - ``order_basis`` -- if ``True``, the nullspace is obtained from an order basis (Pade-Hermite approximants)
+      of the matrix instead of lifting an inverse. In this mode, ``inverse`` is ignored, the solver returns a
+      nullspace basis of minimal degree, and it stops as soon as the degree bound specified via ``degrees`` 
+      (if any) is certified. Default: ``False``.
 
     OUTPUT:
 
@@ -1415,6 +2228,10 @@ def newton(subsolver, inverse=lambda mat:mat.inverse()):
        sage: V = my_solver(A)
        sage: A*V[0]
        (0, 0, 0, 0)
+       sage: my_solver = newton(sage_native, order_basis=True)
+       sage: V = my_solver(A)
+       sage: A*V[0]
+       (0, 0, 0, 0)
 
     ALGORITHM:
 
@@ -1429,6 +2246,17 @@ def newton(subsolver, inverse=lambda mat:mat.inverse()):
     #. Compute :math:`W\cdot V`, rewrite it as nullspace basis mod :math:`x^{2k}`, apply rational
        reconstruction, clear denominators, and return the result. 
 
+    With ``order_basis=True``:
+
+    #. Call the subsolver on a homomorphic image to get an upper bound for the dimension of the nullspace.
+    #. Compute an order basis `P` of the matrix `A` to the order `x^\sigma`, where `\sigma` exceeds the
+       degree of `A` plus the expected degree `e` of the solution, by divide-and-conquer (matrix multiplication
+       over `K[x]`) on top of an iterative algorithm for small orders. The columns of `P` of degree at most `e`
+       are exact solutions, and they generate all solutions of degree at most `e`.
+    #. If ``degrees`` was specified, take `e` from there. Otherwise, start with a small `e` and double it
+       (extending the order basis) until the number of solutions matches the dimension bound.
+    #. Bring the basis into a normal form which does not depend on the choices made during the computation.
+
     .. NOTE::
 
        It is assumed that the subsolver returns a nullspace basis which is normalized so that when the
@@ -1437,6 +2265,8 @@ def newton(subsolver, inverse=lambda mat:mat.inverse()):
     """
     def newton_solver(mat, degrees=[], infolevel=0) :
         """See docstring of newton() for further information."""
+        if order_basis:
+            return _newton_order_basis(subsolver, mat, degrees, infolevel)
         return _newton(subsolver, inverse, mat, degrees, infolevel)
     return newton_solver
 
@@ -1519,6 +2349,134 @@ def _newton(subsolver, inverse, mat, degrees, infolevel):
     
     return [ vector(R, v) for v in V ]
 
+def _newton_order_basis(subsolver, mat, degrees, infolevel):
+    r"""
+    Internal version of nullspace.newton_ for order_basis=True.
+    """
+    n, m = mat.dimensions(); R = mat.parent().base_ring(); x = R.gen(); K = R.base_ring()
+    matdeg = max([0] + [ mat[i,j].degree() for i in xrange(n) for j in xrange(m) ])
+    _launch_info(infolevel, "newton", dim = (n, m), deg = matdeg, domain = R)
+
+    # an upper bound for the dimension of the nullspace (which is exact with high probability)
+    point = K.random_element()
+    dim = len(subsolver(mat.apply_map(lambda p: p(point), K), infolevel=_alter_infolevel(infolevel, -1, 1)))
+    if dim == 0:
+        return []
+
+    bound = (m - dim)*matdeg # worst case degree of a minimal nullspace basis
+    if len(degrees) > 0 and degrees[0] >= 0:
+        e = bound = min(bound, degrees[0])
+    else:
+        e = min(bound, max(1, matdeg))
+
+    sigma = e + matdeg + 1
+    _info(infolevel, "computing order basis to order", sigma, alter = -1)
+    P, shift = _order_basis(mat, sigma, [ 0 for j in xrange(m) ])
+
+    while True:
+        # columns of degree <= e are exact solutions, since A*p = 0 mod x^sigma and deg(A*p) < sigma.
+        sol = [ j for j in xrange(m) if max(P[i,j].degree() for i in xrange(m)) <= e ]
+        if len(sol) >= dim or e >= bound:
+            break
+        e_new = min(2*e, bound); sigma_new = e_new + matdeg + 1
+        _info(infolevel, "extending order basis to order", sigma_new, alter = -1)
+        G = (mat*P).apply_map(lambda p: p.shift(-sigma).truncate(sigma_new - sigma))
+        P2, shift = _order_basis(G, sigma_new - sigma, shift)
+        P = P*P2; e = e_new; sigma = sigma_new
+
+    _info(infolevel, "found", len(sol), "solutions of degree at most", e, alter = -1)
+    if len(sol) == 0:
+        return []
+    N = P.matrix_from_columns(sol)
+
+    # normal form: N*adj(N[I]) where I are the first linearly independent rows of N, with content removed.
+    if len(sol) > 1:
+        I = N.apply_map(lambda p: p(point), K).transpose().pivots()
+        while len(I) < len(sol): # unlucky evaluation point
+            point = K.random_element()
+            I = N.apply_map(lambda p: p(point), K).transpose().pivots()
+        N = N*N.matrix_from_rows(I).adjugate()
+    V = []
+    for v in N.columns():
+        g = R.zero()
+        for p in v:
+            g = g.gcd(p)
+        V.append(v.apply_map(lambda p: p // g, R))
+    return _normalize(V)
+
+def _order_basis(F, sigma, shift, threshold=16):
+    r"""
+    Computes an order basis of the polynomial matrix ``F`` to the order `x^\sigma`, i.e., a matrix `P` whose
+    columns generate all vectors `p` with `F p = 0 mod x^\sigma` and which is minimal with respect to the given
+    shifts of the column degrees. Returns `P` together with the shifted degrees of its columns.
+
+    Orders above ``threshold`` are handled by divide-and-conquer, using multiplication of polynomial matrices.
+    """
+    if sigma <= threshold:
+        return _mbasis(F, sigma, shift)
+
+    s1 = sigma//2
+    P1, shift = _order_basis(F.apply_map(lambda p: p.truncate(s1)), s1, shift, threshold)
+    G = (F*P1).apply_map(lambda p: p.shift(-s1).truncate(sigma - s1)) # MOST COSTLY STEP
+    P2, shift = _order_basis(G, sigma - s1, shift, threshold)
+    return P1*P2, shift # MOST COSTLY STEP
+
+def _mbasis(F, sigma, shift):
+    # order basis for small orders, see _order_basis. The residual F*P is updated along with P, and
+    # in the k-th step, its coefficients of x^k are cancelled by gaussian elimination on its columns.
+
+    R = F.base_ring(); K = R.base_ring(); x = R.gen(); n, m = F.dimensions()
+    P = matrix(R, m, m, 1); G = F.apply_map(lambda p: p.truncate(sigma)); shift = list(shift)
+
+    for k in xrange(sigma):
+        C = G.apply_map(lambda p: p[k], K)
+        pivots = []
+        for j in sorted(xrange(m), key=lambda j: (shift[j], j)):
+            for (r, jp) in pivots:
+                if C[r, j] != 0:
+                    c = -C[r, j]/C[r, jp]
+                    C.add_multiple_of_column(j, jp, c); P.add_multiple_of_column(j, jp, c); G.add_multiple_of_column(j, jp, c)
+            for r in xrange(n):
+                if C[r, j] != 0:
+                    pivots.append((r, j)); break
+        for (r, j) in pivots:
+            P.rescale_col(j, x); G.rescale_col(j, x); shift[j] += 1
+
+    return P, shift
+
+def _interpolation_basis(F, points, shift, R):
+    r"""
+    Computes an interpolation basis for the values ``F`` at the given ``points``, i.e., a matrix `P` over the
+    univariate polynomial ring ``R`` whose columns generate all vectors `p` with `\sum_j p_j(a) F_j(a) = 0` for
+    every point `a`, and which is minimal with respect to the given shifts of the column degrees. Here, ``F`` is
+    a list of vectors over the ground field, the `j`-th of which contains the values `F_j(a)` for all points `a`.
+    Returns `P` together with the shifted degrees of its columns.
+
+    This is the analog of _mbasis for the modulus `\prod_a (x - a)` instead of a power of `x`. The residual
+    values at all points are updated along with `P`, using vector operations.
+    """
+    K = R.base_ring(); x = R.gen(); m = len(F); zero = K.zero(); N = len(points)
+    V = [ vector(K, v) for v in F ]; shift = list(shift)
+    P = [ [ R.one() if i == j else R.zero() for i in xrange(m) ] for j in xrange(m) ] # P[j] is the j-th column
+    pts = vector(K, points); ones = vector(K, [K.one()]*N)
+
+    for k in xrange(N):
+        piv = None
+        for j in sorted(xrange(m), key=lambda j: (shift[j], j)):
+            if V[j][k] == zero:
+                continue
+            elif piv is None:
+                piv = j
+            else:
+                c = -V[j][k]/V[piv][k]
+                V[j] += c*V[piv]; P[j] = [ a + c*b for (a, b) in zip(P[j], P[piv]) ]
+        if piv is not None:
+            a = K(points[k])
+            V[piv] = V[piv].pairwise_product(pts - a*ones)
+            P[piv] = [ (x - a)*b for b in P[piv] ]; shift[piv] += 1
+
+    return matrix(R, m, m, lambda i, j: P[j][i]), shift
+
 def clear(subsolver):
     """
     Constructs a solver which clears denominators in a given matrix over `FF(R)[x..]` or `FF(R[x..])`
@@ -1849,6 +2807,232 @@ def _compress(subsolver, presolver, modulus, mat, degrees, infolevel):
                 
     return V
 
+def auto(probe=True, ncpus=1):
+    r"""
+    Creates a solver which inspects the matrix and dispatches to the solver it expects to be fastest.
+
+    INPUT:
+
+    - ``probe`` -- if ``True`` (default), the dimension of the nullspace is predicted from a homomorphic
+      image over `GF(p)`, and for larger matrices the candidate solvers are timed on a small submatrix
+      of the image of the matrix modulo a word size prime before the actual computation starts.
+    - ``ncpus`` -- maximum number of cpus that may be used in parallel by the chosen solver (default=1).
+
+    OUTPUT:
+
+    - a solver for matrices with entries in `K[x,...]` where `K` is `ZZ` or `GF(p)`.
+
+    EXAMPLES::
+
+       sage: from ore_algebra.nullspace import *
+       sage: A = MatrixSpace(GF(1093)['x'], 4, 7).random_element(degree=3)
+       sage: my_solver = auto()
+       sage: V = my_solver(A)
+       sage: A*V[0]
+       (0, 0, 0, 0)
+       sage: A = MatrixSpace(ZZ['x', 'y'], 4, 5).random_element()
+       sage: V = my_solver(A)
+       sage: A*V[0]
+       (0, 0, 0, 0)
+
+    ALGORITHM:
+
+    #. Classify the matrix by its base ring and the orders of magnitude of its dimensions, its maximal
+       degree and its density, and look the class up in a table of choices shared by all solvers of
+       this kind in the current process.
+    #. If the class is new, list the candidates (gauss_, lagrange_, hermite_, compress_, wiedemann_,
+       and kronecker_ variants of these for several variables, all of them under cra_ if `K` is `ZZ`,
+       and fraction free elimination for `K` = `ZZ`) in the order suggested by a heuristic based on
+       the shape, degree and density of the matrix. If probing is enabled and the matrix is not tiny,
+       time the modular variants on a submatrix of at most eight rows of a homomorphic image.
+    #. Apply the candidates in the order of their ranking until one of them succeeds. Candidates which
+       fail, or which miss solutions predicted by the homomorphic image, are moved to the end of the
+       ranking for this class.
+    #. Record the time spent by the successful candidate in the table, and rank the candidates again
+       by their expected running time: the average of the recorded timings of a candidate if it has
+       been applied before, and otherwise its probing time, scaled by the average ratio between
+       recorded and probing timings of the candidates for which both are known. Candidates without
+       any timing follow in heuristic order.
+
+    .. NOTE::
+
+       - The table can be inspected with ``auto_table()`` and cleared with ``auto_table().clear()``.
+       - This solver is not used by default. Pass it explicitly as ``solver`` to the methods that
+         accept one. The choice depends on the solvers applied earlier in the same session and, once
+         timings are recorded, on the machine. The basis returned may therefore be normalized
+         differently from one session or machine to another. Over `ZZ`, most candidates are based on
+         cra_ with ``proof=False``, and their result is correct only with high probability.
+
+    """
+    def auto_solver(mat, degrees=[], infolevel=0):
+        """See docstring of auto() for further information."""
+        return _auto(probe, ncpus, mat, degrees, infolevel)
+    return auto_solver
+
+# maps problem classes to dictionaries with the ranking of the candidate solvers and the observed timings
+_auto_choices = dict()
+
+def auto_table():
+    r"""
+    Returns the table in which the solvers created by auto_ record their choices and timings.
+
+    The keys of the table are tuples ``(R, n, m, d, s)`` where `R` is a ring and `n`, `m`, `d`, `s` are
+    the binary logarithms of the number of rows, the number of columns, and the maximal degree, and the
+    density of the matrix in quarters. The values are dictionaries with an entry ``'ranking'`` (a list
+    of candidate names), an entry ``'probe'`` (a dictionary with the probing timings in seconds), an
+    entry ``'failed'`` (the names of the candidates which failed, in the order of their last failure)
+    and, for every candidate that was applied successfully, an entry with the list of timings in seconds.
+
+    EXAMPLES::
+
+       sage: from ore_algebra.nullspace import *
+       sage: auto_table().clear()
+       sage: A = MatrixSpace(GF(1093)['x'], 4, 7).random_element(degree=3)
+       sage: V = auto(probe=False)(A)
+       sage: choice = list(auto_table().values())[0]
+       sage: choice['ranking']
+       ['gauss', 'lagrange', 'hermite']
+       sage: len(choice['gauss'])
+       1
+
+    """
+    return _auto_choices
+
+def _auto_candidates(R, n, m, deg, density, dim, ncpus):
+    r"""
+    Returns a list of pairs (name, solver) for matrices over ``R``, most promising first,
+    together with the names of those which may return an incomplete nullspace basis.
+    """
+    modular = R.characteristic() > 0
+    small = n*m*max(deg, 1) < 32
+    gauss_name = 'gauss' if density >= 0.25 else 'gauss/sparse'
+    base = [ (gauss_name, gauss(ncpus=ncpus, sparse=(density < 0.25))) ]
+    if len(R.gens()) == 1:
+        if deg >= 8:
+            base.insert(0, ('lagrange', lagrange(sage_native, ncpus=ncpus)))
+        else:
+            base.append(('lagrange', lagrange(sage_native, ncpus=ncpus)))
+        base.append(('hermite', hermite()))
+    else:
+        base = [ ('kronecker' + name[5:], kronecker(solver)) for (name, solver) in base ] \
+               + [ ('kronecker/lagrange', kronecker(lagrange(sage_native, ncpus=ncpus))) ]
+    if n > m:
+        base.insert(0, ('compress/' + base[0][0], compress(base[0][1])))
+    if dim is not None and dim <= 1 and density < 0.25:
+        base.insert(0, ('wiedemann', wiedemann()))
+    partial = ['hermite', 'wiedemann']
+    if modular:
+        return base, partial
+    cands = [ ('cra/' + name, cra(solver, ncpus=ncpus)) for (name, solver) in base ]
+    fraction_free = ('gauss' if len(R.gens()) == 1 else 'kronecker', kronecker(gauss()))
+    if small:
+        cands.insert(0, fraction_free) # no modular overhead for tiny matrices
+    else:
+        cands.append(fraction_free)
+    return cands, [ 'cra/' + name for name in partial ]
+
+def _auto(probe, ncpus, mat, degrees, infolevel):
+    r"""
+    Internal version of nullspace.auto_.
+    """
+    R = mat.parent().base_ring(); (n, m) = mat.dimensions(); x = R.gens(); zero = R.zero()
+    _launch_info(infolevel, "auto", dim=(n, m), domain=R)
+
+    entries = [ p for p in mat.list() if p != zero ]
+    deg = max([ p.degree() for p in entries ] + [0])
+    density = float(len(entries))/max(1, n*m)
+    size = lambda k: int(math.log(k + 1, 2))
+    key = (R, size(n), size(m), size(deg), int(4*density))
+
+    # the tiny modular run: predict the dimension of the nullspace from an image over GF(p)
+    dim = None
+    if probe:
+        p = R.characteristic() or pp(MAX_MODULUS)
+        phi = dict(zip(x, [ GF(p).random_element() for k in xrange(len(x)) ]))
+        dim = len(sage_native(mat.apply_map(lambda q: q.subs(phi), GF(p))))
+        _info(infolevel, dim, "solutions expected", alter=-1)
+        if dim == 0:
+            return []
+
+    cands, partial = _auto_candidates(R, n, m, deg, density, dim, ncpus)
+    names = [ name for (name, _) in cands ]; cands = dict(cands)
+
+    if not _auto_choices.has_key(key):
+        choice = {'ranking': names, 'probe': dict(), 'failed': []}
+        if probe and size(n*m*deg) > 4:
+            choice['probe'] = _auto_probe(mat, p, names, deg, density, dim, degrees)
+            _info(infolevel, "timings of probing runs:", choice['probe'], alter=-1)
+            choice['ranking'] = _auto_rank(choice, names)
+        _auto_choices[key] = choice
+    choice = _auto_choices[key]
+    ranking = [ name for name in choice['ranking'] if cands.has_key(name) ] \
+              + [ name for name in names if name not in choice['ranking'] ]
+
+    V = None
+    for name in ranking:
+        _info(infolevel, "applying", name, alter=-1)
+        t = time.time()
+        try:
+            V = cands[name](mat, degrees=degrees, infolevel=_alter_infolevel(infolevel, -2, 1))
+        except (ArithmeticError, ValueError, TypeError):
+            V = None
+        if V is None or (dim is not None and name in partial and len(V) < dim and name != ranking[-1]):
+            _info(infolevel, name, "failed", alter=-1)
+            choice['failed'] = [ other for other in choice['failed'] if other != name ] + [name]
+            choice['ranking'] = _auto_rank(choice, choice['ranking'])
+            continue
+        choice.setdefault(name, []).append(time.time() - t)
+        choice['failed'] = [ other for other in choice['failed'] if other != name ]
+        choice['ranking'] = _auto_rank(choice, choice['ranking'])
+        return V
+
+    raise ValueError("no solver applicable to the given matrix")
+
+def _auto_probe(mat, p, names, deg, density, dim, degrees):
+    r"""
+    Times the modular variants of the candidates ``names`` on a submatrix of at most eight rows of the
+    image of ``mat`` modulo ``p``, and returns a dictionary mapping candidate names to timings in seconds.
+    """
+    R = mat.parent().base_ring(); (n, m) = mat.dimensions()
+    k = min(n, 8); l = min(m, k + max(1, m - n))
+    Rp = R.change_ring(GF(p)); matp = mat.matrix_from_rows_and_columns(range(k), range(l)).change_ring(Rp)
+    modcands = dict(_auto_candidates(Rp, k, l, deg, density, dim, 1)[0])
+    timings = dict()
+    for name in names:
+        modname = name[4:] if name.startswith('cra/') else name
+        if R.characteristic() == 0 and modname == name:
+            continue # fraction free elimination has no modular variant
+        if not modcands.has_key(modname):
+            continue
+        t = time.time()
+        try:
+            modcands[modname](matp, degrees=degrees)
+            timings[name] = time.time() - t
+        except (ArithmeticError, ValueError, TypeError):
+            pass
+    return timings
+
+def _auto_rank(choice, names):
+    r"""
+    Ranks the candidates ``names`` by their expected running time according to the entry ``choice``
+    of auto_table_. Candidates without any timing keep their relative order and follow those with
+    timings, and candidates which failed come last.
+    """
+    average = lambda l: sum(l)/len(l)
+    probe = choice['probe']
+    ratios = [ average(choice[name])/probe[name] for name in names if choice.has_key(name) and probe.get(name) ]
+    scale = average(ratios) if ratios else 1.0
+
+    def expected(name):
+        if choice.has_key(name):
+            return average(choice[name])
+        return scale*probe[name]
+
+    failed = [ name for name in choice['failed'] if name in names ]
+    timed = [ name for name in names if name not in failed and (choice.has_key(name) or probe.has_key(name)) ]
+    untimed = [ name for name in names if name not in failed and name not in timed ]
+    return sorted(timed, key=expected) + untimed + failed
+
 def wiedemann():
     r"""
     Constructs a solver using Wiedemann's algorithm
@@ -1942,6 +3126,259 @@ def _wiedemann(A, degrees, infolevel):
         return _normalize([ vector(R, x) ])
 
 
+def block_wiedemann(block_size=None, ncpus=1):
+    r"""
+    Constructs a solver using the block Wiedemann algorithm, for sparse matrices over a field
+
+    INPUT:
+
+    - ``block_size`` -- number of random vectors which are processed simultaneously. If ``None`` (default),
+      ``max(4, ncpus)`` is used. Choosing a multiple of ``ncpus`` keeps all processes busy.
+    - ``ncpus`` -- maximum number of cpus that may be used in parallel by the solver (default=1).
+
+    OUTPUT:
+
+    - a solver for matrices over a field `K`
+
+    EXAMPLES::
+
+       sage: from ore_algebra.nullspace import *
+       sage: A = MatrixSpace(GF(1093), 40, 45, sparse=True).random_element(density=0.1)
+       sage: V = block_wiedemann()(A)
+       sage: len(V) == 45 - A.rank() and all(A*v == 0 for v in V)
+       True
+
+    For matrices of polynomials, the solver can be combined with other solvers::
+
+       sage: A = MatrixSpace(GF(1093)['x'], 4, 7).random_element(degree=3)
+       sage: V = lagrange(block_wiedemann())(A)
+       sage: A*V[0]
+       (0, 0, 0, 0)
+
+    ALGORITHM: block Wiedemann algorithm.
+
+    #. The matrix is padded with zero rows or truncated after a random mixing of its rows, to make it
+       square, and it is multiplied from both sides by random butterfly networks. This preserves the
+       sparsity of the matrix, as the products are never formed explicitly.
+    #. For random blocks `X` and `Y` of ``block_size`` vectors, compute the matrices `X^T B^(i+1) Y` for
+       `i` up to about `2 n/b`, where `B` is the square matrix, `n` its dimension, and `b` the block size.
+       The columns of `Y` are handled independently, in up to ``ncpus`` processes, with the matrix
+       stored as list of sparse rows.
+    #. Compute a minimal matrix generator of this sequence via a sigma basis.
+    #. Each column of the generator gives rise to a linear combination of the vectors `B^k Y` which is
+       (after some further multiplications by `B`, if necessary) probably a kernel vector. Only vectors
+       which are verified to belong to the kernel are kept.
+    #. If as many new kernel vectors as the block size were found, the kernel may have a higher dimension,
+       and the process is repeated with new random blocks.
+
+    .. NOTE::
+
+       #. The solver returns the reduced echelon basis of the kernel vectors found. All of them are
+          correct, but with a small probability, the nullspace may have a higher dimension.
+
+       #. Unlike wiedemann_, the solver returns a full nullspace basis.
+
+    """
+    def block_wiedemann_solver(mat, degrees=[], infolevel=0):
+        """See docstring of block_wiedemann() for further information"""
+        return _block_wiedemann(block_size, ncpus, mat, degrees, infolevel)
+    return block_wiedemann_solver
+
+def _block_wiedemann(block_size, ncpus, mat, degrees, infolevel):
+    """
+    Internal version of nullspace.block_wiedemann_
+    """
+    K = mat.parent().base_ring(); (n, m) = mat.dimensions(); zero = K.zero(); one = K.one()
+    _launch_info(infolevel, "block_wiedemann", dim=(n, m), domain=K)
+
+    if not K.is_field():
+        raise TypeError, "block_wiedemann requires a matrix over a field"
+    if m == 0:
+        return []
+
+    b = block_size if block_size is not None else max(4, ncpus)
+
+    rows = [ [] for i in xrange(n) ]
+    for (i, j), a in mat.dict().iteritems():
+        rows[i].append((j, K(a)))
+
+    # The matrix is made square and preconditioned by random butterfly networks on both sides, which
+    # keeps the cost of a product with a vector proportional to the number of nonzero entries (up to a
+    # logarithmic factor). With high probability, the square matrix B has the same kernel as the input
+    # matrix (up to the right preconditioner), and this kernel does not meet the image of B, so that all
+    # kernel vectors are reachable.
+    sq = (rows, _butterfly(max(n, m), K), _butterfly(m, K), m)
+
+    L = 2*int(math.ceil(float(m)/b)) + 4 # number of terms of the matrix sequence
+    basis = [] # echelon basis of the kernel vectors found so far
+
+    while True:
+
+        X = [ [ K.random_element() for i in xrange(m) ] for r in xrange(b) ]
+        Y = [ [ K.random_element() for i in xrange(m) ] for c in xrange(b) ]
+        pool = WorkerPool(_block_wiedemann_krylov, (sq, X, Y, L, zero), ncpus)
+
+        try:
+            _info(infolevel, "Computing Krylov sequence", alter=-1)
+            S = [ [ [ zero for c in xrange(b) ] for r in xrange(b) ] for i in xrange(L) ]
+            for ((c, coeffs), seq) in pool.map([ (c, None) for c in xrange(b) ]): ###### MOST EXPENSIVE STEP (if matrix is big)
+                for i in xrange(L):
+                    for r in xrange(b):
+                        S[i][r][c] = seq[i][r]
+
+            _info(infolevel, "Computing minimal generator", alter=-1)
+            P, shift = _sigma_basis(S, b, L, zero, one) ###### MOST EXPENSIVE STEP (if block size is big)
+
+            # a column (u, q) of the sigma basis with S*u = q mod t^L gives rise to a generator of degree delta
+            # of the first L - delta terms of the sequence, provided that deg(u) <= delta and deg(q) < delta.
+            gens = [] # reversed columns of the generator, as lists of coefficient vectors 
+            for col in P:
+                deg_u = max([ t for t in xrange(len(col)) if any(col[t][:b]) ] or [-1])
+                deg_q = max([ t for t in xrange(len(col)) if any(col[t][b:]) ] or [-1])
+                delta = max(deg_u, deg_q + 1)
+                if deg_u < 0 or L - delta <= m // b:
+                    continue # no generator, or valid for too few terms
+                gens.append([ col[delta - k][:b] if delta - k < len(col) else [zero]*b for k in xrange(delta + 1) ])
+
+            _info(infolevel, "Computing", len(gens), "solution candidates", alter=-1)
+            W = [ [ zero for i in xrange(m) ] for f in gens ]
+            if gens:
+                for ((c, coeffs), acc) in pool.map([ (c, [ [ fk[c] for fk in f ] for f in gens ]) for c in xrange(b) ]):
+                    for g in xrange(len(gens)):
+                        W[g] = [ w + a for w, a in zip(W[g], acc[g]) ]
+        finally:
+            pool.close()
+
+        candidates = []
+        for v in W:
+            if not any(v):
+                continue
+            for e in xrange(L):
+                Bv = _block_wiedemann_matvec(sq, v, zero)
+                if not any(Bv):
+                    break
+                v = Bv
+            else:
+                continue
+            v = _butterfly_apply(sq[2], v) # undo the right preconditioner
+            if n > m and any(_sparse_matvec(rows, v, zero)):
+                continue
+            candidates.append(v)
+
+        if not candidates:
+            break
+        new_basis = [ w for w in matrix(K, basis + candidates).echelon_form().rows() if any(w) ]
+        added = len(new_basis) - len(basis); basis = new_basis
+        _info(infolevel, "Found", added, "new nullspace basis vectors.", alter=-1)
+        if added < b or len(basis) == m:
+            break
+
+    return _normalize([ vector(K, v) for v in basis ])
+
+def _sparse_matvec(rows, v, zero):
+    # product of a matrix given as list of sparse rows (lists of pairs (j, a)) and a vector given as list
+    return [ sum((a*v[j] for j, a in row), zero) for row in rows ]
+
+def _block_wiedemann_matvec(sq, v, zero):
+    # product of the preconditioned square matrix sq = (rows, left butterfly, right butterfly, dimension) and v
+    rows, bf_left, bf_right, m = sq
+    w = _sparse_matvec(rows, _butterfly_apply(bf_right, v), zero)
+    w.extend(zero for i in xrange(m - len(w)))
+    return _butterfly_apply(bf_left, w)[:m]
+
+def _butterfly(m, K):
+    # a random butterfly network of dimension m, as list of quadruples (i, j, a, b), each representing
+    # the invertible transformation (v[i], v[j]) -> (v[i] + a*v[j], v[j] + b*(v[i] + a*v[j]))
+    bf = []; s = 1
+    while s < m:
+        for i in xrange(m):
+            if (i // s) % 2 == 0 and i + s < m:
+                bf.append((i, i + s, K.random_element(), K.random_element()))
+        s *= 2
+    return bf
+
+def _butterfly_apply(bf, v):
+    v = list(v)
+    for (i, j, a, b) in bf:
+        v[i] += a*v[j]; v[j] += b*v[i]
+    return v
+
+def _block_wiedemann_krylov(data, arg):
+    # work for the c-th column y of the block Y: if coeffs is None, compute the projections X*B^(i+1)*y for
+    # i=0..L-1, otherwise compute, for each entry f of coeffs, the vector sum(f[k]*B^k*y for k)
+
+    sq, X, Y, L, zero = data; c, coeffs = arg
+    w = Y[c]
+
+    if coeffs is None:
+        seq = []
+        for i in xrange(L):
+            w = _block_wiedemann_matvec(sq, w, zero)
+            seq.append([ sum((xl*wl for xl, wl in zip(xr, w)), zero) for xr in X ])
+        return seq
+
+    acc = [ [ zero for wl in w ] for f in coeffs ]
+    for k in xrange(max(len(f) for f in coeffs)):
+        for g in xrange(len(coeffs)):
+            f = coeffs[g]
+            if k < len(f) and f[k] != zero:
+                a = f[k]; acc[g] = [ s + a*wl for s, wl in zip(acc[g], w) ]
+        w = _block_wiedemann_matvec(sq, w, zero)
+    return acc
+
+def _sigma_basis(S, b, L, zero, one):
+    """
+    Computes an order basis of the b x 2b matrix [S(t), -I] to the order t^L, where S(t) is the sum
+    of the S[i]*t^i for b x b matrices S[i] given as lists of rows.
+
+    Returns a list of 2b columns, each given as the list of its coefficient vectors (of length 2b),
+    together with the list of the degree bounds of the columns.
+    """
+
+    P = [ [ [ one if r == j else zero for r in xrange(2*b) ] ] for j in xrange(2*b) ]
+    shift = [ 0 for j in xrange(2*b) ]
+
+    for k in xrange(L):
+
+        # the coefficients of t^k in [S(t), -I]*P[j]
+        R = []
+        for j in xrange(2*b):
+            col = P[j]; res = [ zero for r in xrange(b) ]
+            for t in xrange(max(0, k - len(col) + 1), k + 1):
+                u = col[k - t]; St = S[t]
+                nz = [ l for l in xrange(b) if u[l] != zero ]
+                if nz:
+                    for r in xrange(b):
+                        Str = St[r]
+                        res[r] += sum(Str[l]*u[l] for l in nz)
+            if k < len(col):
+                q = col[k]
+                for r in xrange(b):
+                    res[r] -= q[b + r]
+            R.append(res)
+
+        # eliminate, processing the columns by increasing degree bounds
+        pivots = []
+        for j in sorted(xrange(2*b), key=lambda j: (shift[j], j)):
+            Rj = R[j]
+            for (r, jp) in pivots:
+                if Rj[r] != zero:
+                    c = Rj[r]/R[jp][r]
+                    Rj = R[j] = [ e - c*ep for e, ep in zip(Rj, R[jp]) ]
+                    col = P[j]
+                    for t in xrange(len(P[jp])):
+                        if t == len(col):
+                            col.append([ zero for r2 in xrange(2*b) ])
+                        col[t] = [ e - c*ep for e, ep in zip(col[t], P[jp][t]) ]
+            for r in xrange(b):
+                if Rj[r] != zero:
+                    pivots.append((r, j)); break
+
+        for (r, j) in pivots:
+            P[j].insert(0, [ zero for r2 in xrange(2*b) ]); shift[j] += 1
+
+    return P, shift
+
 #################################################################################################################
 
 #def take_picture(mat, idx):
@@ -1729,7 +1729,7 @@ class OreAlgebra_generic(Algebra):
 
         # make a reasonable choice
         if R.is_prime_field() and R.characteristic() > 0:
-            return nullspace.sage_native
+            return nullspace.numpy_native # falls back to sage_native for p >= 2^31
         elif R is ZZ or R is QQ:
             return nullspace.sage_native
         elif is_NumberField(R):
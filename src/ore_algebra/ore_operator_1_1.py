@@ -22,6 +22,8 @@ one generator.
 
 from __future__ import absolute_import
 
+from collections import deque
+
 import sage.functions.log as symbolic_log
 
 from sage.arith.all import previous_prime as pp
@@ -39,7 +41,7 @@ from sage.rings.power_series_ring import PowerSeriesRing
 from sage.structure.element import RingElement, canonical_coercion
 from sage.symbolic.all import SR
 
-from .tools import q_log, make_factor_iterator, shift_factor
+from .tools import q_log, make_factor_iterator, shift_factor, WorkerPool
 from .ore_operator import OreOperator, UnivariateOreOperator
 from .generalized_series import GeneralizedSeriesMonoid, _generalized_series_shift_quotient, _binomial
 
@@ -2057,6 +2059,9 @@ class UnivariateDifferentialOperatorOverUnivariateRing(UnivariateOreOperatorOver
           target accuracy
         - ``post_transform`` (default: identity) - differential operator to be
           applied to the solutions, see examples below
+        - ``ncpus`` (integer, default 1) - number of processes among which the
+          top levels of the product trees are distributed when the series
+          are summed by binary splitting (``algorithm="binsplit"``)
 
         OUTPUT:
 
@@ -2247,6 +2252,9 @@ class UnivariateDifferentialOperatorOverUnivariateRing(UnivariateOreOperatorOver
         - ``path`` - a path on the complex plane, specified as a list of
           vertices `z_0, \dots, z_n`
         - ``eps`` (floating-point number or ball) - target accuracy
+        - ``ncpus`` (integer, default 1) - number of processes among which the
+          top levels of the product trees are distributed when the series
+          are summed by binary splitting (``algorithm="binsplit"``)
 
         OUTPUT:
 
@@ -2558,7 +2566,7 @@ class UnivariateRecurrenceOperatorOverUnivariateRing(UnivariateOreOperatorOverUn
         """
         return self.to_D('D').to_T(alg)        
 
-    def to_list(self, init, n, start=0, append=False, padd=False):
+    def to_list(self, init, n, start=0, append=False, padd=False, fraction_free=False, primes=None):
         """
         Computes the terms of some sequence annihilated by ``self``.
 
@@ -2576,6 +2584,16 @@ class UnivariateRecurrenceOperatorOverUnivariateRing(UnivariateOreOperatorOverUn
         - ``padd`` (optional) -- if ``True``, the vector of initial values is implicitely
           prolonged to the left (!) by zeros if it is too short. Otherwise (default),
           the method raises a ``ValueError`` if ``init`` is too short.
+        - ``fraction_free`` (optional) -- if ``True``, and the coefficients of ``self``
+          are in ``ZZ`` or ``QQ``, the recurrence is unrolled on integer numerators
+          with a common denominator, which is only divided out when terms are produced.
+          This avoids the normalization of rational numbers in the inner loop and is
+          usually faster when many terms are needed. For other coefficient domains, the
+          option is ignored. Defaults to ``False``.
+        - ``primes`` (optional) -- a list of primes below `2^{31}`. If given, the terms
+          are computed modulo all these primes simultaneously, see below. This requires
+          the coefficients of ``self`` and the initial values to be rational.
+          The option ``append`` is ignored in this case. 
 
         OUTPUT:
 
@@ -2583,6 +2601,12 @@ class UnivariateRecurrenceOperatorOverUnivariateRing(UnivariateOreOperatorOverUn
         index ``start+k``.
         Terms whose calculation causes an error are represented by ``None``. 
 
+        If ``primes`` is given, the output is a ``numpy`` array of type ``int64`` whose
+        `k` th row carries the residues of the sequence term with index ``start+k``
+        modulo the given primes, one column for each prime.
+        Residues which cannot be computed, e.g. because the leading coefficient of ``self``
+        vanishes at some index modulo the respective prime, are represented by `-1`. 
+
         EXAMPLES::
 
            sage: from ore_algebra import *
@@ -2605,11 +2629,204 @@ class UnivariateRecurrenceOperatorOverUnivariateRing(UnivariateOreOperatorOverUn
             (46189*x^10 - 109395*x^8 + 90090*x^6 - 30030*x^4 + 3465*x^2 - 63)/256]
            sage: ((n-5)*Sn - 1).to_list([1], 10)
            [1, 1/-5, 1/20, 1/-60, 1/120, -1/120, None, None, None, None]
+
+        Fraction free unrolling gives the same results::
+
+           sage: R.<n> = ZZ['n']; A.<Sn> = OreAlgebra(R, 'Sn')
+           sage: L = (n+3)*(n+2)*Sn^2 - 2*(n+2)*(3*n+5)*Sn + 9*n*(n+1)
+           sage: L.to_list([1, 1/2], 100, fraction_free=True) == L.to_list([1, 1/2], 100)
+           True
+           sage: ((n-5)*Sn - 1).to_list([1], 10, fraction_free=True)
+           [1, -1/5, 1/20, -1/60, 1/120, -1/120, None, None, None, None]
+           sage: R.<n> = GF(7)['n']; A.<Sn> = OreAlgebra(R, 'Sn')
+           sage: ((n+2)*Sn - (4*n+2)).to_list([1], 5, fraction_free=True) # ignored
+           [1, 1, 2, 5, 0]
+           sage: R.<n> = ZZ['n']; A.<Sn> = OreAlgebra(R, 'Sn')
+
+        Terms modulo several primes::
+
+           sage: L = (n+2)*Sn - (4*n+2)
+           sage: a = L.to_list([1], 8, primes=[5, 7, 1000003])
+           sage: a.shape
+           (8, 3)
+           sage: a.tolist()
+           [[1, 1, 1], [1, 1, 1], [2, 2, 2], [0, 5, 5], [-1, 0, 14], [-1, 0, 42], [-1, -1, 132], [-1, -1, 429]]
+           sage: [c % 1000003 for c in L.to_list([1], 8)] == a[:, 2].tolist()
+           True
         
         """
-        return _rec2list(self, init, n, start, append, padd, ZZ)
+        if primes is not None:
+            return _rec2array(self, init, n, start, padd, primes)
+        return _rec2list(self, init, n, start, append, padd, ZZ, fraction_free=fraction_free)
 
-    def forward_matrix_bsplit(self, n, start=0):
+    def iter_terms(self, init, start=0, padd=False, fraction_free=False):
+        """
+        Iterates over the terms of some sequence annihilated by ``self``.
+
+        INPUT:
+
+        - ``init`` -- a vector (or list or tuple) of initial values.
+          The components must be elements of ``self.base_ring().base_ring().fraction_field()``.
+          If the length is more than ``self.order()``, we do not check whether the given
+          terms are consistent with ``self``. 
+        - ``start`` (optional) -- index of the sequence term which is represented
+          by the first entry of ``init``. Defaults to zero.
+        - ``padd`` (optional) -- if ``True``, the vector of initial values is implicitely
+          prolonged to the left (!) by zeros if it is too short. Otherwise (default),
+          the method raises a ``ValueError`` if ``init`` is too short.
+        - ``fraction_free`` (optional) -- if ``True``, use integer arithmetic in
+          the inner loop as explained in ``to_list``. Defaults to ``False``.
+
+        OUTPUT:
+
+        An iterator which first yields the entries of ``init`` and then the subsequent
+        terms of the sequence, without end. Only the last ``self.order()`` terms are
+        kept, so arbitrarily many terms can be produced in constant memory, and
+        the iteration can be suspended and resumed at any time.
+        As in ``to_list``, terms whose calculation causes an error, as well as all
+        terms after them, are represented by ``None``.
+
+        EXAMPLES::
+
+           sage: from ore_algebra import *
+           sage: R.<n> = ZZ['n']; A.<Sn> = OreAlgebra(R, 'Sn')
+           sage: L = (n+2)*Sn - (4*n+2)
+           sage: it = L.iter_terms([1])
+           sage: [next(it) for i in range(6)]
+           [1, 1, 2, 5, 14, 42]
+           sage: [next(it) for i in range(3)]
+           [132, 429, 1430]
+           sage: from itertools import islice
+           sage: list(islice(L.iter_terms([1]), 20)) == L.to_list([1], 20)
+           True
+           sage: list(islice(((n-5)*Sn - 1).iter_terms([1]), 8))
+           [1, 1/-5, 1/20, 1/-60, 1/120, -1/120, None, None]
+        
+        """
+        return _rec2iter(self, init, start, padd, ZZ, fraction_free=fraction_free)
+
+    def nth_term(self, init, N, start=0, values=None, threshold=64, ncpus=1):
+        r"""
+        Computes a single term of some sequence annihilated by ``self`` using binary splitting.
+
+        INPUT:
+
+        - ``init`` -- a vector (or list or tuple) of initial values.
+          The components must be elements of ``self.base_ring().base_ring().fraction_field()``.
+          If the length is more than ``self.order()``, only the last ``self.order()`` entries
+          are used. 
+        - ``N`` -- index of the desired term. 
+        - ``start`` (optional) -- index of the sequence term which is represented
+          by the first entry of ``init``. Defaults to zero.
+        - ``values`` (optional) -- a dictionary which maps indices `k` for which the
+          term `c_k` cannot be computed from the previous ones, because the leading
+          coefficient of ``self`` vanishes, to the value of `c_k`. Other entries are ignored.
+        - ``threshold`` (optional) -- below this number of companion matrices, their
+          product is computed by a plain loop rather than by recursive splitting.
+          Defaults to 64. 
+        - ``ncpus`` (optional) -- number of processes among which the top levels
+          of the product tree are distributed. Defaults to 1.
+
+        OUTPUT:
+
+        The term with index ``N`` of the sequence, or ``None`` if it cannot be computed
+        because a term at a singular index is needed which is not given in ``values``.
+
+        The product of the companion matrices is computed by division-free binary splitting
+        on matrices stored as flat lists. Rational coefficients of ``self`` are made integral
+        beforehand, and the content of the product is removed before it is applied to the
+        initial values. Singular indices are skipped by splitting the product at them.
+
+        EXAMPLES::
+
+           sage: from ore_algebra import *
+           sage: R.<n> = ZZ['n']; A.<Sn> = OreAlgebra(R, 'Sn')
+           sage: L = (n+2)*Sn - (4*n+2)
+           sage: L.nth_term([1], 10)
+           16796
+           sage: L.nth_term([1], 1000) == catalan_number(1000)
+           True
+           sage: L = (n+3)*(n+2)*Sn^2 - 2*(n+2)*(3*n+5)*Sn + 9*n*(n+1)
+           sage: L.nth_term([1, 1/2], 500) == L.to_list([1, 1/2], 501)[-1]
+           True
+           sage: L.nth_term([1, 1/2], 500, threshold=1) == L.nth_term([1, 1/2], 500)
+           True
+           sage: L.nth_term([1, 1/2], 500, ncpus=2) == L.nth_term([1, 1/2], 500)
+           True
+           sage: ((n-5)*Sn - 1).nth_term([1], 5)
+           -1/120
+           sage: ((n-5)*Sn - 1).nth_term([1], 8) is None
+           True
+           sage: ((n-5)*Sn - 1).nth_term([1], 8, values={6: 1})
+           1/2
+
+        The coefficients may depend on parameters::
+
+           sage: R = ZZ['x']['n']; x = R('x'); n = R('n')
+           sage: A.<Sn> = OreAlgebra(R, 'Sn')
+           sage: L = ((n+2)*Sn^2 - x*(2*n+3)*Sn + (n+1))
+           sage: L.nth_term([1, x], 6)
+           (231*x^6 - 315*x^4 + 105*x^2 - 5)/16
+
+        """
+        r = self.order()
+        K = self.base_ring().base_ring().fraction_field()
+
+        if start <= N < start + len(init):
+            return init[N - start]
+        elif N < start:
+            raise ValueError, "cannot compute terms before the initial values."
+        elif len(init) < r:
+            raise ValueError, "not enough initial values."
+
+        if values is None:
+            values = {}
+
+        if r == 0:
+            return K.zero() if self[0](N) != 0 else values.get(N)
+
+        window = self._nth_window(init, N, start, values, threshold, ncpus)
+
+        return None if window is None else window[-1]
+
+    def _nth_window(self, init, N, start, values, threshold=64, ncpus=1):
+        """
+        Internal version of ``nth_term``, which returns the list of the ``self.order()``
+        terms with indices up to ``N``, or ``None``. It is assumed that ``self.order() > 0``
+        and that ``N`` is beyond the initial values. 
+        """
+        r = self.order()
+        K = self.base_ring().base_ring().fraction_field()
+
+        coeffs = list(self)
+        if self.base_ring().base_ring() is QQ:
+            den = lcm([p.denominator() for p in coeffs])
+            coeffs = [(den*p).change_ring(ZZ) for p in coeffs]
+
+        s = start + len(init) - r
+        window = [K(c) for c in init[len(init) - r:]]
+
+        try:
+            singular = sorted(k for k in self.singularities() if s + r <= k <= N)
+        except (NotImplementedError, TypeError, ValueError):
+            singular = [] # singular indices will be noticed by a vanishing denominator
+
+        # the same workers serve all segments between singularities
+        pool = _forward_matrix_pool(coeffs, r, threshold, ncpus) if ncpus > 1 else None
+        try:
+            for k in singular:
+                window = _apply_forward_matrix(coeffs, r, s, k - r, window, threshold, ncpus, pool)
+                if window is None or k not in values:
+                    return None
+                window = window[1:] + [K(values[k])]
+                s = k - r + 1
+
+            return _apply_forward_matrix(coeffs, r, s, N - r + 1, window, threshold, ncpus, pool)
+        finally:
+            if pool is not None:
+                pool.close()
+
+    def forward_matrix_bsplit(self, n, start=0, ncpus=1):
         r"""
         Uses division-free binary splitting to compute a product of ``n``
         consecutive companion matrices of ``self``.
@@ -2622,6 +2839,8 @@ class UnivariateRecurrenceOperatorOverUnivariateRing(UnivariateOreOperatorOverUn
 
         - ``n`` -- desired number of terms to move forward
         - ``start`` (optional) -- starting index. Defaults to zero.
+        - ``ncpus`` (optional) -- number of processes among which the top levels
+          of the product tree are distributed. Defaults to 1.
 
         OUTPUT:
 
@@ -2650,6 +2869,9 @@ class UnivariateRecurrenceOperatorOverUnivariateRing(UnivariateOreOperatorOverUn
             [               63/8*x^5 - 35/4*x^3 + 15/8*x]
             [231/16*x^6 - 315/16*x^4 + 105/16*x^2 - 5/16]
 
+            sage: ann.forward_matrix_bsplit(50, ncpus=4) == ann.forward_matrix_bsplit(50)
+            True
+
         TODO: this should detect if the base coefficient ring is QQ (etc.)
         and then switch to ZZ (etc.) internally.
         """
@@ -2675,8 +2897,141 @@ class UnivariateRecurrenceOperatorOverUnivariateRing(UnivariateOreOperatorOverUn
                 M1, Q1 = bsplit(a, m)
                 M2, Q2 = bsplit(m, b)
                 return M2 * M1, Q2 * Q1
+        if ncpus > 1 and n >= 2*ncpus:
+            mul = lambda high, low: (high[0] * low[0], high[1] * low[1])
+            return _parallel_bsplit(bsplit, mul, start, start + n, ncpus)
         return bsplit(start, start + n)
 
+    def forward_matrix_bsgs(self, n, start=0, m=None):
+        r"""
+        Uses baby-step giant-step to compute a product of ``n`` consecutive
+        companion matrices of ``self``, when the coefficients of ``self`` are
+        polynomials over a finite field.
+
+        For fixed order and degree of ``self``, this takes `O(\sqrt{n})` field
+        operations up to logarithmic factors, so that terms with huge indices
+        of a sequence modulo `p` are within reach.
+
+        INPUT:
+
+        - ``n`` -- desired number of terms to move forward
+        - ``start`` (optional) -- starting index. Defaults to zero.
+        - ``m`` (optional) -- number of companion matrices which are multiplied
+          in a baby step. Defaults to about `\sqrt{n/d}`, where `d` is the degree
+          of ``self``.
+
+        OUTPUT:
+
+        A pair `(M, Q)` as in ``forward_matrix_bsplit``. If `Q` is zero, the
+        leading coefficient of ``self`` vanishes at one of the indices. 
+
+        ALGORITHM:
+
+        Since the companion matrices are periodic with period `p`, the
+        characteristic of the base field, ``n`` is first reduced below `p` by
+        means of a matrix power. The product of ``m`` consecutive companion
+        matrices is then computed as a polynomial matrix `B(k)` by binary
+        splitting (baby steps). It is evaluated at the indices ``start``,
+        ``start + m``, ``start + 2*m``, ... by fast multipoint evaluation with a
+        subproduct tree, and the resulting matrices are multiplied together
+        (giant steps).
+
+        EXAMPLES::
+
+            sage: from ore_algebra import *
+            sage: R.<n> = GF(1019)['n']; A.<Sn> = OreAlgebra(R, 'Sn')
+            sage: L = (n^2+1)*Sn^2 - (2*n+3)*Sn + n
+            sage: L.forward_matrix_bsgs(500) == L.forward_matrix_bsplit(500)
+            True
+            sage: L.forward_matrix_bsgs(500, start=7, m=3) == L.forward_matrix_bsplit(500, start=7)
+            True
+            sage: L.forward_matrix_bsgs(3*1019 + 5) == L.forward_matrix_bsplit(3*1019 + 5)
+            True
+            sage: M, Q = L.forward_matrix_bsgs(10^12)
+            sage: Q.is_zero()
+            False
+
+        """
+        from sage.matrix.matrix_space import MatrixSpace
+        from .nullspace import product_tree, multipoint_evaluate
+
+        assert n >= 0
+        r = self.order()
+
+        R = self.base_ring(); K = R.base_ring(); k = R.gen()
+        if not K.is_finite():
+            raise TypeError, "coefficients must be polynomials over a finite field"
+        p = K.characteristic()
+
+        matrix_ring = MatrixSpace(K, r, r)
+        coeffs = list(self)
+
+        if n > p:
+            P, QP = self.forward_matrix_bsgs(p, start, m)
+            q, n = divmod(n, p)
+            M, Q = self.forward_matrix_bsgs(n, start, m)
+            return M * P**q, Q * QP**q
+
+        def naive(VM, VQ, a, b):
+            for j in xrange(a, b):
+                M = matrix_ring()
+                Q = coeffs[r](j)
+                for i in range(r-1):
+                    M[i, i+1] = Q
+                for i in range(r):
+                    M[r-1, i] = -coeffs[i](j)
+                VM = M * VM
+                VQ = Q * VQ
+            return VM, VQ
+
+        if m is None:
+            d = max(max(c.degree() for c in coeffs), 1)
+            m = ZZ(n // d).isqrt()
+        m = min(max(m, 1), max(n, 1))
+
+        if n < 2*m:
+            return naive(matrix_ring.one(), K.one(), start, start + n)
+
+        # Baby steps
+        poly_matrix_ring = MatrixSpace(R, r, r)
+
+        def bsplit(a, b):
+            if b - a == 1:
+                M = poly_matrix_ring()
+                Q = coeffs[r](k + a)
+                for i in range(r-1):
+                    M[i, i+1] = Q
+                for i in range(r):
+                    M[r-1, i] = -coeffs[i](k + a)
+                return M, Q
+            else:
+                c = a + (b - a) // 2
+                M1, Q1 = bsplit(a, c)
+                M2, Q2 = bsplit(c, b)
+                return M2 * M1, Q2 * Q1
+
+        B, QB = bsplit(0, m)
+
+        # Giant steps
+        g = n // m
+        points = [R(start + j*m) for j in xrange(g)]
+        tree = product_tree(k, points, 0, g)
+
+        def evaluate(poly):
+            values = []
+            multipoint_evaluate(poly % tree[0], points, 0, g, tree, values)
+            return values
+
+        values = [evaluate(e) for e in B.list()]
+        Qvalues = evaluate(QB)
+
+        M = matrix_ring.one(); Q = K.one()
+        for j in xrange(g):
+            M = matrix_ring([v[j] for v in values]) * M
+            Q = Qvalues[j] * Q
+
+        return naive(M, Q, start + g*m, start + n)
+
     def _delta_matrix(self, m):
 
         from sage.matrix.matrix_space import MatrixSpace
@@ -2843,6 +3198,137 @@ class UnivariateRecurrenceOperatorOverUnivariateRing(UnivariateOreOperatorOverUn
 
         return value_M, value_Q
 
+    def forward_matrix_param_rectangular_batch(self, values, n, start=0, m=None):
+        """
+        Computes ``self.forward_matrix_param_rectangular(value, n, start, m)``
+        for every ``value`` in the list ``values``. 
+
+        The matrices of the rectangular splitting are computed only once. All
+        polynomials in the parameter `x` which arise in the baby steps and giant
+        steps are then evaluated at all values at once, using fast multipoint
+        evaluation with a subproduct tree when the values are exact elements of
+        the fraction field of `R`.
+
+        OUTPUT:
+
+        A list of pairs `(M, Q)`, one for each entry of ``values``.
+
+        TESTS::
+
+            sage: from sage.all import randrange
+            sage: from ore_algebra import *
+            sage: R = ZZ
+            sage: Rx = R['x']; x = Rx.gen()
+            sage: Rxk = Rx['k']; k = Rxk.gen()
+            sage: Rxks = OreAlgebra(Rxk, 'Sk')
+            sage: for i in range(100):
+            ....:     A = Rxks.random_element(randrange(1,4))
+            ....:     values = [QQ.random_element() for j in range(randrange(0,10))]
+            ....:     start = randrange(0,5)
+            ....:     n = randrange(0,30)
+            ....:     m = randrange(0,10)
+            ....:     batch = A.forward_matrix_param_rectangular_batch(values, n, m=m, start=start)
+            ....:     if batch != [A.forward_matrix_param_rectangular(v, n, m=m, start=start) for v in values]:
+            ....:         raise ValueError
+            sage: A = Rxks([1+k, -3*x - 2*k*x, 2+k])
+            sage: [M[1,1] for (M, Q) in A.forward_matrix_param_rectangular_batch([1, 2], 5)]
+            [1764, 251118]
+
+        """
+        from sage.matrix.matrix_space import MatrixSpace
+        from .nullspace import product_tree, multipoint_evaluate
+
+        assert n >= 0
+        r = self.order()
+        values = list(values)
+
+        indexed_ring = self.base_ring()
+        parametric_ring = indexed_ring.base_ring()
+        scalar_ring = parametric_ring.base_ring()
+
+        coeffs = list(self)
+
+        # Step size
+        if m is None:
+            m = floor(n ** 0.25)
+        m = max(m, 1)
+        m = min(m, n)
+
+        delta_M, delta_Q = self._delta_matrix(m)
+
+        # All polynomials in the parameter which have to be evaluated, in the
+        # order in which they are consumed below
+        polys = []
+
+        def baby_polys(a, b):
+            for j in xrange(a, b):
+                polys.append(coeffs[r](start + j))
+                polys.extend(-coeffs[i](start + j) for i in range(r))
+
+        baby_polys(0, m)
+        if m != 0:
+            for j in range(m, n - m + 1, m):
+                v = start + j - m
+                polys.append(delta_Q(v))
+                polys.extend(delta_M[row, col](v) for row in range(r) for col in range(r))
+            remainder = n % m
+            baby_polys(n - remainder, n)
+
+        # Evaluate all of them at all values
+        field = scalar_ring.fraction_field()
+        if len(values) > 0 and all(v in ZZ or v.parent() is field or v.parent() is scalar_ring for v in values):
+            P = parametric_ring.change_ring(field)
+            points = [P(v) for v in values]
+            tree = product_tree(P.gen(), points, 0, len(points))
+            def evaluate_all(poly):
+                result = []
+                multipoint_evaluate(P(poly) % tree[0], points, 0, len(points), tree, result)
+                return result
+        else:
+            def evaluate_all(poly):
+                return [poly(v) for v in values]
+
+        table = [evaluate_all(p) for p in polys]
+
+        output = []
+
+        for t in xrange(len(values)):
+
+            value_ring = (scalar_ring.zero() * values[t]).parent()
+            value_matrix_ring = MatrixSpace(value_ring, r, r)
+            entries = (value_ring(e[t]) for e in table)
+
+            def baby_steps(VM, VQ, a, b):
+                for j in xrange(a, b):
+                    M = value_matrix_ring()
+                    Q = next(entries)
+                    for i in range(r-1):
+                        M[i, i+1] = Q
+                    for i in range(r):
+                        M[r-1, i] = next(entries)
+                    VM = M * VM
+                    VQ = Q * VQ
+                return VM, VQ
+
+            value_M, value_Q = baby_steps(value_matrix_ring.one(), scalar_ring.one(), 0, m)
+
+            if m != 0:
+                step_M = value_M
+                step_Q = value_Q
+
+                for j in range(m, n - m + 1, m):
+                    step_Q = step_Q + next(entries)
+                    step_M = step_M + value_matrix_ring([next(entries) for i in xrange(r*r)])
+                    value_M = step_M * value_M
+                    value_Q = step_Q * value_Q
+
+                remainder = n % m
+                value_M, value_Q = baby_steps(value_M, value_Q, n-remainder, n)
+
+            output.append((value_M, value_Q))
+
+        return output
+
     def annihilator_of_sum(self):
         r"""
         Returns an operator `L` which annihilates all the indefinite sums `\sum_{k=0}^n a_k`
@@ -3552,6 +4038,12 @@ class UnivariateQRecurrenceOperatorOverUnivariateRing(UnivariateOreOperatorOverU
         _, q = self.parent().is_Q()
         return _rec2list(self, init, n, start, append, padd, lambda n: q**n)
 
+    def iter_terms(self, init, start=0, padd=False):
+        _, q = self.parent().is_Q()
+        return _rec2iter(self, init, start, padd, lambda n: q**n)
+
+    iter_terms.__doc__ = UnivariateRecurrenceOperatorOverUnivariateRing.iter_terms.__doc__
+
     def annihilator_of_sum(self):
         r"""
         Returns an operator `L` which annihilates all the indefinite sums `\sum_{k=0}^n a_k`
@@ -4293,7 +4785,7 @@ class UnivariateEulerDifferentialOperatorOverUnivariateRing(UnivariateOreOperato
 
 #############################################################################################################
 
-def _rec2list(L, init, n, start, append, padd, deform, singularity_handler=None):
+def _rec2list(L, init, n, start, append, padd, deform, singularity_handler=None, fraction_free=False):
     """
     Common code for computing terms of holonomic and q-holonomic sequences.
     """
@@ -4315,13 +4807,13 @@ def _rec2list(L, init, n, start, append, padd, deform, singularity_handler=None)
         if append:
             for i in xrange(padd):
                 terms.insert(0, z)
-            terms = _rec2list(L, terms, min(n, r) + padd, start - padd, True, False, deform, singularity_handler)
+            terms = _rec2list(L, terms, min(n, r) + padd, start - padd, True, False, deform, singularity_handler, fraction_free)
             for i in xrange(padd):
                 terms.remove(0)
         else:
-            terms = _rec2list(L, [z]*padd + terms, min(n, r) + padd, start - padd, False, False, deform, singularity_handler)[padd:]
+            terms = _rec2list(L, [z]*padd + terms, min(n, r) + padd, start - padd, False, False, deform, singularity_handler, fraction_free)[padd:]
 
-        return _rec2list(L, terms, n, start, append, False, deform, singularity_handler)
+        return _rec2list(L, terms, n, start, append, False, deform, singularity_handler, fraction_free)
 
     if None in terms:
         for k in xrange(len(terms), n):
@@ -4332,6 +4824,14 @@ def _rec2list(L, init, n, start, append, padd, deform, singularity_handler=None)
         if terms[-i - 1] not in K:
             raise TypeError, "illegal initial value object"
 
+    if fraction_free and singularity_handler is None:
+        it = _rec2iter(L, terms[len(terms) - r:], start + len(terms) - r, False, deform, fraction_free=True)
+        for i in xrange(r):
+            next(it)
+        for k in xrange(len(terms), n):
+            terms.append(next(it))
+        return terms
+
     rec = L.numerator().coefficients(sparse=False); sigma = L.parent().sigma()
     rec = tuple( -sigma(p, -r) for p in rec )
     lc = -rec[-1]
@@ -4350,6 +4850,308 @@ def _rec2list(L, init, n, start, append, padd, deform, singularity_handler=None)
             terms.append(singularity_handler(k + start))
 
     return terms
+
+def _rec2array(L, init, n, start, padd, primes):
+    """
+    Common code for computing terms of holonomic sequences modulo several word size primes. 
+
+    Returns a ``numpy`` array with ``max(n, len(init))`` rows and one column per prime.
+    Residues which cannot be computed are represented by `-1`.
+    """
+
+    r = L.order()
+    K = L.base_ring().base_ring().fraction_field()
+
+    if K is not QQ:
+        raise TypeError, "modular unrolling requires rational coefficients"
+
+    primes = [ZZ(p) for p in primes]
+    for p in primes:
+        if p.nbits() > 31 or not p.is_prime():
+            raise ValueError, "moduli must be primes below 2^31"
+
+    terms = list(init); skip = 0
+    if len(terms) < r:
+        if not padd:
+            raise ValueError, "not enough initial values."
+        skip = r - len(terms)
+        terms = [K.zero()]*skip + terms
+        start -= skip
+
+    def residues(c):
+        if c is None:
+            return [-1]*len(primes)
+        c = QQ(c); a = c.numerator(); b = c.denominator()
+        return [int(a*b.inverse_mod(p) % p) if b % p != 0 else -1 for p in primes]
+
+    rec = L.numerator().coefficients(sparse=False); sigma = L.parent().sigma()
+    rec = tuple( -sigma(p, -r) for p in rec )
+    den = lcm([p.denominator() for p in rec])
+    rec = [ [ZZ(c) for c in (den*p).coefficients(sparse=False)] for p in rec ]
+
+    out = _unroll_mod_primes(rec[:-1], [-c for c in rec[-1]], [residues(t) for t in terms],
+                             max(n, len(init)) + skip, start, [int(p) for p in primes])
+
+    return out[skip:]
+
+def _unroll_mod_primes(rec, lc, init, rows, start, primes):
+    r"""
+    Unrolls a recurrence modulo several primes at once.
+
+    ``rec`` is the list of the `r` integer coefficient lists of the polynomials
+    `p_0, \ldots, p_{r-1}` and ``lc`` the coefficient list of `q` such that
+    `q(k) c_k = \sum_i p_i(k) c_{k-r+i}`. ``init`` is a list of rows of residues
+    of the initial terms, `-1` marking unknown residues.
+
+    Each step is carried out with vector operations on all primes, keeping the window
+    of the last `r` terms over a common denominator. A single modular inversion per
+    prime is needed at the end, after which the denominators of all terms are
+    recovered by a backwards pass over the leading coefficients. 
+    """
+    import numpy
+
+    r = len(rec)
+    P = numpy.array(primes, dtype=numpy.int64)
+    out = numpy.zeros((max(rows, len(init)), len(primes)), dtype=numpy.int64)
+    lcs = numpy.ones((rows, len(primes)), dtype=numpy.int64)
+    failed = numpy.full(len(primes), out.shape[0], dtype=numpy.int64)
+
+    for k in xrange(len(init)):
+        out[k] = init[k]
+        failed = numpy.where((out[k] < 0) & (failed > k), k, failed)
+
+    if len(init) >= rows:
+        return out
+
+    def table(coeffs):
+        return [numpy.array([int(c % p) for p in primes], dtype=numpy.int64) for c in coeffs]
+
+    def evaluate(coeffs, k):
+        acc = numpy.zeros(len(primes), dtype=numpy.int64)
+        for c in reversed(coeffs):
+            acc = (acc*k + c) % P
+        return acc
+
+    rec = [table(p) for p in rec]
+    lc = table(lc)
+    window = [numpy.where(out[k] < 0, 0, out[k]) for k in xrange(len(init) - r, len(init))]
+    for k in xrange(len(init)):
+        out[k] = numpy.where(failed <= k, -1, out[k])
+    den = numpy.ones(len(primes), dtype=numpy.int64)
+
+    for k in xrange(len(init), rows):
+        kp = (start + k) % P
+        lck = evaluate(lc, kp)
+        failed = numpy.where((lck == 0) & (failed > k), k, failed)
+        lck[lck == 0] = 1
+        num = numpy.zeros(len(primes), dtype=numpy.int64)
+        for i in xrange(r):
+            num = (num + window[i]*evaluate(rec[i], kp)) % P
+        window = [(w*lck) % P for w in window[1:]] + [num]
+        den = (den*lck) % P
+        out[k] = num
+        lcs[k] = lck
+
+    # Backwards pass: inv is the inverse of the common denominator of the term at index k. 
+    inv = numpy.array([pow(int(d), p - 2, p) for d, p in zip(den, primes)], dtype=numpy.int64)
+    for k in xrange(rows - 1, len(init) - 1, -1):
+        out[k] = (out[k]*inv) % P
+        inv = (inv*lcs[k]) % P
+
+    for j in xrange(len(primes)):
+        out[failed[j]:, j] = -1
+
+    return out
+
+def _forward_matrix_flat(coeffs, r, a, b, threshold):
+    """
+    Division free binary splitting for the product of the companion matrices of the
+    recurrence with coefficients ``coeffs`` at the indices `a, ..., b - 1`.
+
+    Matrices are represented as flat lists of length `r^2` in row major order.
+    Returns a pair `(M, Q)` as in ``forward_matrix_bsplit``. 
+    """
+    if b - a <= threshold:
+        one = coeffs[r].base_ring().one(); zero = coeffs[r].base_ring().zero()
+        M = [one if i == j else zero for i in xrange(r) for j in xrange(r)]
+        Q = one
+        for k in xrange(a, b):
+            q = coeffs[r](k); c = [coeffs[i](k) for i in xrange(r)]
+            last = [-sum(c[l]*M[l*r + j] for l in xrange(r)) for j in xrange(r)]
+            M = [q*m for m in M[r:]] + last
+            Q *= q
+        return M, Q
+
+    m = a + (b - a) // 2
+    M1, Q1 = _forward_matrix_flat(coeffs, r, a, m, threshold)
+    M2, Q2 = _forward_matrix_flat(coeffs, r, m, b, threshold)
+
+    return [sum(M2[i*r + l]*M1[l*r + j] for l in xrange(r)) for i in xrange(r) for j in xrange(r)], Q2*Q1
+
+def _bsplit_pool(bsplit, ncpus):
+    """
+    Returns a pool of ``ncpus`` workers which evaluate ``bsplit(lo, hi)`` for pairs ``(lo, hi)``,
+    to be passed to ``_parallel_bsplit``. 
+    """
+    return WorkerPool(lambda data, arg: bsplit(arg[0], arg[1]), None, ncpus)
+
+def _parallel_bsplit(bsplit, mul, a, b, ncpus, pool=None):
+    """
+    Computes the product ``bsplit(a, b)`` of a sequence of matrices by cutting the
+    range into ``ncpus`` pieces, whose products are computed by ``bsplit`` in parallel
+    processes. The partial products are then multiplied together, as a balanced tree,
+    in the current process. ``mul(high, low)`` must return the product of two partial
+    products, the one of the higher indices being the left factor. 
+
+    If a ``pool`` created by ``_bsplit_pool`` for the same ``bsplit`` is given, its workers
+    are used; otherwise, a temporary pool is created.
+    """
+    if pool is None:
+        with _bsplit_pool(bsplit, ncpus) as pool:
+            return _parallel_bsplit(bsplit, mul, a, b, ncpus, pool)
+
+    cuts = [a + (i*(b - a))//ncpus for i in xrange(ncpus + 1)]
+    parts = sorted( (u[0], v) for (u, v) in pool.map(zip(cuts[:-1], cuts[1:])) )
+    parts = [ v for (_, v) in parts ]
+
+    while len(parts) > 1:
+        parts = [ mul(parts[i + 1], parts[i]) for i in xrange(0, len(parts) - 1, 2) ] + parts[len(parts) - len(parts) % 2:]
+
+    return parts[0]
+
+def _forward_matrix_pool(coeffs, r, threshold, ncpus):
+    """
+    Returns a pool of workers for the parallel version of ``_apply_forward_matrix``,
+    which can be shared by several calls with the same ``coeffs``, ``r`` and ``threshold``.
+    """
+    return _bsplit_pool(lambda lo, hi: _forward_matrix_flat(coeffs, r, lo, hi, threshold), ncpus)
+
+def _apply_forward_matrix(coeffs, r, a, b, window, threshold, ncpus=1, pool=None):
+    """
+    Moves the vector ``window`` of the terms with indices `a, ..., a + r - 1` forward
+    to the terms with indices `b, ..., b + r - 1`.
+
+    Returns ``None`` if some of the companion matrices in between is singular. 
+    If ``ncpus > 1``, the workers of the given ``pool`` (see ``_forward_matrix_pool``)
+    are used, if any.
+    """
+    if b <= a:
+        return window
+
+    if ncpus > 1 and b - a > ncpus*threshold:
+        def mul(high, low):
+            (M2, Q2), (M1, Q1) = high, low
+            return [sum(M2[i*r + l]*M1[l*r + j] for l in xrange(r)) for i in xrange(r) for j in xrange(r)], Q2*Q1
+        M, Q = _parallel_bsplit(lambda lo, hi: _forward_matrix_flat(coeffs, r, lo, hi, threshold), mul, a, b, ncpus, pool)
+    else:
+        M, Q = _forward_matrix_flat(coeffs, r, a, b, threshold)
+
+    if Q.is_zero():
+        return None
+
+    if Q.parent() is ZZ:
+        g = gcd(M + [Q])
+        if g != 1:
+            M = [m // g for m in M]; Q //= g
+
+    return [sum(M[i*r + j]*window[j] for j in xrange(r))/Q for i in xrange(r)]
+
+def _rec2iter(L, init, start, padd, deform, fraction_free=False):
+    """
+    Common code for iterating over the terms of holonomic and q-holonomic sequences.
+
+    Only a window of the last ``L.order()`` terms is kept between two steps. 
+
+    If ``fraction_free`` is set and the coefficients of ``L`` are rational, ``deform``
+    must map integers to integers. The window is then stored as a vector of integer
+    numerators over a common denominator, whose content is only removed from time
+    to time. For other coefficients, ``fraction_free`` is ignored.
+    """
+
+    r = L.order()
+    K = L.base_ring().base_ring().fraction_field()
+    terms = list(init)
+    skip = 0
+
+    if len(terms) < r:
+        if not padd:
+            raise ValueError, "not enough initial values."
+        skip = r - len(terms)
+        terms = [K.zero()]*skip + terms
+        start -= skip
+
+    singular = None in terms
+
+    if not singular:
+        for i in xrange(r):
+            if terms[-i - 1] not in K:
+                raise TypeError, "illegal initial value object"
+
+    rec = L.numerator().coefficients(sparse=False); sigma = L.parent().sigma()
+    rec = tuple( -sigma(p, -r) for p in rec )
+
+    fraction_free = fraction_free and K is QQ # only available for rational coefficients
+    if fraction_free:
+        den = lcm([p.denominator() for p in rec])
+        rec = tuple( (den*p).change_ring(ZZ) for p in rec )
+
+    lc = -rec[-1]
+
+    def iterator():
+
+        for i in xrange(skip, len(terms)):
+            yield terms[i]
+
+        if not singular and fraction_free:
+
+            window = [QQ(t) for t in terms[len(terms) - r:]]
+            den = lcm([t.denominator() for t in window] + [ZZ.one()])
+            window = deque([ZZ(den*t) for t in window], r)
+            k = start + len(terms)
+            del terms[:]
+            bits = den.nbits()
+
+            while True:
+                kk = deform(k)
+                lck = lc(kk)
+                if lck.is_zero():
+                    break
+                num = sum(window[i]*rec[i](kk) for i in xrange(r))
+                for i in xrange(r):
+                    window[i] *= lck
+                window.append(num)
+                den *= lck
+                yield num/den
+                k += 1
+                # The common denominator tends to grow faster than the terms.
+                # Remove the content every time it has doubled in size. 
+                if den.nbits() > 2*bits + 64:
+                    g = gcd(list(window) + [den])
+                    if g != 1:
+                        for i in xrange(r):
+                            window[i] //= g
+                        den //= g
+                    bits = den.nbits()
+
+        elif not singular:
+
+            window = deque(terms[len(terms) - r:], r)
+            k = start + len(terms)
+            del terms[:]
+
+            while True:
+                lck = lc(deform(k))
+                if lck.is_zero():
+                    break
+                term = (~lck)*sum(window[i]*rec[i](deform(k)) for i in xrange(r))
+                window.append(term)
+                yield term
+                k += 1
+
+        while True:
+            yield None
+
+    return iterator()
     
 def _power_series_solutions(op, rec, n, deform):
     """
@@ -31,6 +31,8 @@ from sage.rings.polynomial.polynomial_ring import is_PolynomialRing
 from sage.rings.polynomial.multi_polynomial_ring import is_MPolynomialRing
 from sage.rings.fraction_field import is_FractionField
 
+import multiprocessing
+
 def q_log(q, u):
     """
     Determines, if possible, an integer n such that q^n = u.
@@ -225,3 +227,67 @@ def shift_factor(p, ram=ZZ.one(), q=1):
         c[1].sort(key=lambda e: e[0])
 
     return classes
+
+_pool_fun = None
+_pool_data = None
+
+def _pool_init(fun, data):
+    # runs once in each worker process of a WorkerPool
+    global _pool_fun, _pool_data
+    _pool_fun = fun; _pool_data = data
+
+def _pool_call(job):
+    # only the position of the argument is sent back with the result
+    k, arg = job
+    return (k, _pool_fun(_pool_data, arg))
+
+class WorkerPool(object):
+    """
+    A pool of long-lived worker processes which evaluate a function ``fun(data, arg)`` for many small
+    arguments ``arg`` (typically moduli) and a fixed, possibly large, ``data`` (typically a matrix or a
+    list of terms).
+
+    The workers are forked when the pool is created and inherit ``fun`` and ``data`` from the calling
+    process, so neither of them is ever pickled. Afterwards, only the arguments are sent to the workers,
+    and only the results, tagged with the position of their argument, are sent back. If ``ncpus`` is 1, or if the calling process is itself a worker, no processes are
+    created and the function is evaluated in the calling process.
+
+    The pool should be closed when it is no longer needed, either explicitly or by using it in a
+    ``with`` statement.
+
+    EXAMPLES::
+
+        sage: from ore_algebra.tools import WorkerPool
+        sage: with WorkerPool(lambda data, p: sum(data) % p, range(100), ncpus=2) as pool:
+        ....:     sorted(pool.map([7, 11, 13]))
+        [(7, 1), (11, 0), (13, 10)]
+    """
+
+    def __init__(self, fun, data, ncpus=1):
+        self._fun = fun; self._data = data; self._pool = None
+        if ncpus > 1 and not multiprocessing.current_process().daemon:
+            self._pool = multiprocessing.Pool(ncpus, _pool_init, (fun, data))
+
+    def map(self, args):
+        """
+        Returns an iterator over the pairs ``(arg, fun(data, arg))`` for the elements ``arg`` of ``args``,
+        in the order in which the results become available. Exceptions raised by ``fun`` are propagated
+        to the caller. 
+        """
+        if self._pool is None:
+            return ( (arg, self._fun(self._data, arg)) for arg in args )
+        args = list(args)
+        return ( (args[k], res) for (k, res) in self._pool.imap_unordered(_pool_call, enumerate(args)) )
+
+    def close(self):
+        """
+        Terminates the worker processes.
+        """
+        if self._pool is not None:
+            self._pool.terminate(); self._pool.join(); self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()